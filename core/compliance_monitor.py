@@ -4,35 +4,130 @@ MNSF Compliance Monitor
 Ensures all operations comply with 3GPP standards and global regulations
 """
 
-import yaml
-import json
+import os
+import re
 import time
+import atexit
+import queue
 import logging
+import logging.handlers
+from collections import Counter, defaultdict, deque
+from itertools import islice
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Tuple
 import jsonschema
 from dataclasses import dataclass, asdict
 from enum import Enum
 import hashlib
+import selectors
+import struct
 import sys
+import threading
+import numpy as np
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - COMPLIANCE - %(levelname)s - %(message)s',
-    handlers=[
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Run as a script, only core/ is on sys.path; shared helpers import from the repository root
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.fileio import dump_json, load_config, load_file
+
+logger = logging.getLogger('compliance_monitor')
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+def _configure_logging():
+    """Route compliance logs through a queue so callers never block on disk I/O"""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    formatter = logging.Formatter('%(asctime)s - COMPLIANCE - %(levelname)s - %(message)s')
+    handlers = [
         logging.FileHandler('/var/log/mnsf/compliance.log'),
         logging.StreamHandler()
     ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+# 3GPP standards document schema, compiled once and reused for every load
+STANDARDS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "version": {"type": "string"},
+        "standards": {"type": "array"},
+        "requirements": {"type": "object"}
+    },
+    "required": ["version", "standards"]
+}
+_STANDARDS_VALIDATOR = jsonschema.Draft7Validator(STANDARDS_SCHEMA)
+
+# Retained history; reports only read the most recent entries
+OPERATIONS_LOG_SIZE = 10_000
+RECENT_OPERATIONS = 100
+VIOLATIONS_LOG_SIZE = 1_000
+ENFORCEMENT_WINDOW = 10  # most recent violations considered when blocking an operation
+
+def _tail(entries: deque, n: int) -> List[Dict]:
+    """Return the last n entries of a deque, oldest first"""
+    tail = list(islice(reversed(entries), n))
+    tail.reverse()
+    return tail
+
+GNSS_CONFIG_PATH = '/etc/mnsf/gnss/active.conf'
+
+# Markers a compliant GNSS-SDR configuration must contain
+GNSS_CONFIG_CHECKS = (
+    ('Lab mode enabled', b'LAB MODE ENABLED'),
+    ('Transmission disabled', b'enable_throttle_control=true'),
+    ('GPS L1 frequency', b'1575420000'),
+    ('Compliance header present', b'Compliance Standards:'),
 )
-logger = logging.getLogger('compliance_monitor')
+
+_PACK_DOUBLE = struct.Struct('<d').pack
+_NUMBER_TYPES = (int, float, np.integer, np.floating)
+
+def _operation_id(operation: str, parameters: Dict) -> str:
+    """Hash an operation and its parameters without serializing them to JSON"""
+    h = hashlib.sha256(operation.encode())
+    # Keys hash as text and numbers as doubles, so 1, 1.0 and np.float64(1.0) share an ID
+    for key, value in sorted(((str(k), v) for k, v in parameters.items()), key=lambda item: item[0]):
+        h.update(b'\0' + key.encode() + b'=')
+        if isinstance(value, _NUMBER_TYPES) and not isinstance(value, bool):
+            h.update(_PACK_DOUBLE(float(value)))
+        else:
+            h.update(repr(value).encode())
+    return h.hexdigest()
+
+def _iso(ts_ns: int) -> str:
+    """Format an epoch timestamp in nanoseconds as UTC ISO 8601"""
+    seconds, ns = divmod(int(ts_ns), 1_000_000_000)
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(microsecond=ns // 1000).isoformat()
+
+def _export(record: Dict) -> Dict:
+    """Copy a log record for output, formatting its timestamp"""
+    exported = dict(record)
+    exported['timestamp'] = _iso(exported.pop('ts_ns'))
+    return exported
 
 class ComplianceLevel(Enum):
     LAB = "lab"
     TEST = "test"
     PRODUCTION = "production"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RegulatoryRule:
     """Regulatory rule definition"""
     id: str
@@ -45,12 +140,46 @@ class RegulatoryRule:
 class ComplianceMonitor:
     """Main compliance monitoring class"""
     
+    _gnss_marker_db = None  # Hyperscan database for GNSS_CONFIG_CHECKS, compiled on first use
+    
     def __init__(self, config_path: str = '/app/configs/global_regulations.yaml'):
+        _configure_logging()
+        
         self.config_path = config_path
         self.rules: List[RegulatoryRule] = []
-        self.violations: List[Dict] = []
+        self._compiled_rules: List[Tuple[Callable[[str, Dict], bool], List[Dict]]] = []
+        self._limits_enforced = False
+        self.violations: deque = deque(maxlen=VIOLATIONS_LOG_SIZE)
         self.compliance_level = ComplianceLevel.LAB
-        self.operations_log: List[Dict] = []
+        self._is_lab = True
+        
+        # Guards history and counters; checks may arrive from worker threads
+        self._lock = threading.Lock()
+        
+        # Operation history is kept as columns in a ring buffer; full records
+        # are only retained for the most recent operations shown in reports
+        self.operations_log: deque = deque(maxlen=RECENT_OPERATIONS)
+        self._ops_ts_ns = np.zeros(OPERATIONS_LOG_SIZE, dtype=np.int64)
+        self._ops_compliant = np.zeros(OPERATIONS_LOG_SIZE, dtype=bool)
+        self._ops_oid = np.zeros(OPERATIONS_LOG_SIZE, dtype=np.int32)
+        
+        # Operation names are interned to integer IDs; 3GPP requirement
+        # tables are indexed by ID (None when an operation has none)
+        self._op_ids: Dict[str, int] = {}
+        self._op_names: List[str] = []
+        self._op_reqs: List[Optional[Tuple[Tuple[str, Any, Any, Any], ...]]] = []
+        
+        # Running totals, kept beyond the retained history
+        self.operation_count = 0
+        self.compliant_count = 0
+        self.violation_count = 0
+        self._violation_counts: Counter = Counter()  # per rule, over retained violations
+        
+        # (sequence number, violation) pairs bucketed by operation for enforcement
+        self._recent_by_op: Dict[str, deque] = defaultdict(lambda: deque(maxlen=ENFORCEMENT_WINDOW))
+        
+        # Last GNSS config scan, keyed by the file's (mtime_ns, size)
+        self._gnss_scan: Optional[Tuple[Tuple[int, int], List[Tuple[str, bool]]]] = None
         
         self.load_regulations()
         self.load_3gpp_standards()
@@ -60,11 +189,11 @@ class ComplianceMonitor:
     def load_regulations(self):
         """Load global regulatory framework"""
         try:
-            with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            config = load_config(self.config_path)
             
             # Load compliance level
             self.compliance_level = ComplianceLevel(config.get('compliance_level', 'lab'))
+            self._is_lab = self.compliance_level is ComplianceLevel.LAB
             
             # Load regulatory rules
             for rule_data in config.get('regulatory_rules', []):
@@ -78,64 +207,102 @@ class ComplianceMonitor:
                 )
                 self.rules.append(rule)
             
+            self._compile_limits()
+            self._compile_rules()
             logger.info(f"Loaded {len(self.rules)} regulatory rules")
             
         except Exception as e:
             logger.error(f"Failed to load regulations: {e}")
             raise
     
+    def _compile_limits(self):
+        """Precompute band edges and power limit for the current compliance level"""
+        bands = self._get_allowed_bands()
+        self._bands = tuple((low, high) for low, high in bands)  # scalar checks
+        # Edge arrays for the vectorised check_operations
+        self._band_lows = np.array([low for low, _ in bands], dtype=np.float64)
+        self._band_highs = np.array([high for _, high in bands], dtype=np.float64)
+        self._max_power = -30 if self._is_lab else 10
+    
+    def _compile_rules(self):
+        """Group rules by predicate so each check runs once per operation"""
+        groups: Dict[Callable[[str, Dict], bool], List[Dict]] = {}
+        for rule in self.rules:
+            groups.setdefault(self._rule_predicate(rule), []).append({
+                'rule_id': rule.id,
+                'standard': rule.standard,
+                'description': rule.description,
+                'penalty': rule.penalty
+            })
+        self._compiled_rules = list(groups.items())
+        # check_operations applies the band/power limits only when a rule enforces them
+        self._limits_enforced = self._check_limits in groups
+    
+    def _rule_predicate(self, rule: RegulatoryRule) -> Callable[[str, Dict], bool]:
+        """Select the check enforcing a regulatory rule"""
+        # Implementation depends on rule type
+        # This is a simplified version: every rule shares the band/power limits
+        return self._check_limits
+    
     def load_3gpp_standards(self):
         """Load 3GPP standards"""
         standards_path = '/app/configs/3gpp_standards.json'
         try:
-            with open(standards_path, 'r') as f:
-                self.standards = json.load(f)
+            self.standards = load_file(standards_path)
             
             # Validate schema
-            schema = {
-                "type": "object",
-                "properties": {
-                    "version": {"type": "string"},
-                    "standards": {"type": "array"},
-                    "requirements": {"type": "object"}
-                },
-                "required": ["version", "standards"]
-            }
-            
-            jsonschema.validate(instance=self.standards, schema=schema)
+            _STANDARDS_VALIDATOR.validate(self.standards)
+            self._compile_requirements()
             logger.info(f"Loaded 3GPP standards version: {self.standards['version']}")
             
         except Exception as e:
             logger.error(f"Failed to load 3GPP standards: {e}")
             raise
     
+    def _compile_requirements(self):
+        """Flatten 3GPP requirement specs into (param, min, max, allowed) tuples per operation ID"""
+        self._op_reqs = [None] * len(self._op_names)
+        for operation, requirements in self.standards.get('requirements', {}).items():
+            self._op_reqs[self._intern_operation(operation)] = tuple(
+                (param, spec.get('min'), spec.get('max'), spec.get('allowed'))
+                for param, spec in requirements.items()
+            )
+    
+    def _intern_operation(self, operation: str) -> int:
+        """Return the integer ID of an operation name, assigning one on first use"""
+        oid = self._op_ids.get(operation)
+        if oid is None:
+            oid = self._op_ids[operation] = len(self._op_names)
+            self._op_names.append(operation)
+            self._op_reqs.append(None)
+        return oid
+    
     def check_operation(self, operation: str, parameters: Dict) -> bool:
         """Check if an operation is compliant"""
-        operation_id = hashlib.md5(f"{operation}{json.dumps(parameters)}".encode()).hexdigest()
+        operation_id = _operation_id(operation, parameters)
+        with self._lock:
+            oid = self._intern_operation(operation)
+        ts_ns = time.time_ns()
         
         check_result = {
             'operation': operation,
             'parameters': parameters,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'ts_ns': ts_ns,  # formatted when exported
             'compliant': True,
             'violations': [],
             'operation_id': operation_id
         }
         
         # Check against all rules
-        for rule in self.rules:
-            if not self._check_rule(rule, operation, parameters):
+        for predicate, rule_violations in self._compiled_rules:
+            if not predicate(operation, parameters):
                 check_result['compliant'] = False
-                check_result['violations'].append({
-                    'rule_id': rule.id,
-                    'standard': rule.standard,
-                    'description': rule.description,
-                    'penalty': rule.penalty
-                })
+                check_result['violations'].extend(rule_violations)
         
         # Check 3GPP standards
-        if operation in self.standards.get('requirements', {}):
-            if not self._check_3gpp_requirement(operation, parameters):
+        requirements = self._op_reqs[oid]
+        if requirements is not None:
+            if not self._check_3gpp_requirement(requirements, parameters):
                 check_result['compliant'] = False
                 check_result['violations'].append({
                     'rule_id': '3GPP_VIOLATION',
@@ -145,62 +312,78 @@ class ComplianceMonitor:
                 })
         
         # Log operation
-        self.operations_log.append(check_result)
+        with self._lock:
+            self.operations_log.append(check_result)
+            slot = self.operation_count % OPERATIONS_LOG_SIZE
+            self._ops_ts_ns[slot] = ts_ns
+            self._ops_compliant[slot] = check_result['compliant']
+            self._ops_oid[slot] = oid
+            self.operation_count += 1
+            
+            if check_result['compliant']:
+                self.compliant_count += 1
+            else:
+                self._record_violation(check_result)
         
         if not check_result['compliant']:
-            self.violations.append(check_result)
             logger.warning(f"Non-compliant operation: {operation} - {len(check_result['violations'])} violations")
         
         return check_result['compliant']
     
-    def _check_rule(self, rule: RegulatoryRule, operation: str, parameters: Dict) -> bool:
-        """Check a specific regulatory rule"""
-        # Implementation depends on rule type
-        # This is a simplified version
-        
+    def _check_limits(self, operation: str, parameters: Dict) -> bool:
+        """Check frequency band and TX power limits"""
         # Example: Check frequency bands
         if 'frequency' in parameters:
             freq = parameters['frequency']
             
             # Check if frequency is in allowed bands for lab use
-            allowed_bands = self._get_allowed_bands()
-            
-            if not any(low <= freq <= high for (low, high) in allowed_bands):
+            if not any(low <= freq <= high for low, high in self._bands):
                 logger.warning(f"Frequency {freq} not in allowed bands")
                 return False
         
         # Example: Check power levels
         if 'tx_power' in parameters:
-            max_power = -30 if self.compliance_level == ComplianceLevel.LAB else 10
-            if parameters['tx_power'] > max_power:
-                logger.warning(f"TX power {parameters['tx_power']}dBm exceeds limit {max_power}dBm")
+            if parameters['tx_power'] > self._max_power:
+                logger.warning(f"TX power {parameters['tx_power']}dBm exceeds limit {self._max_power}dBm")
                 return False
         
         return True
     
-    def _check_3gpp_requirement(self, operation: str, parameters: Dict) -> bool:
-        """Check 3GPP specific requirements"""
-        requirements = self.standards['requirements'].get(operation, {})
+    def check_operations(self, frequencies: np.ndarray, tx_powers: np.ndarray) -> np.ndarray:
+        """Check a batch of operations against band and power limits, returning a compliance mask"""
+        # NaN marks a parameter the operation does not set; batches are not logged
+        freqs = np.asarray(frequencies, dtype=np.float64)
+        powers = np.asarray(tx_powers, dtype=np.float64)
+        if not self._limits_enforced:
+            return np.ones(freqs.shape, dtype=bool)
         
-        for param, spec in requirements.items():
+        in_band = ((freqs[:, None] >= self._band_lows) & (freqs[:, None] <= self._band_highs)).any(axis=1)
+        freq_ok = np.isnan(freqs) | in_band
+        power_ok = np.isnan(powers) | (powers <= self._max_power)
+        
+        return freq_ok & power_ok
+    
+    def _check_3gpp_requirement(self, requirements: Tuple, parameters: Dict) -> bool:
+        """Check 3GPP specific requirements"""
+        for param, low, high, allowed in requirements:
             if param in parameters:
                 value = parameters[param]
                 
                 # Check min/max bounds
-                if 'min' in spec and value < spec['min']:
+                if low is not None and value < low:
                     return False
-                if 'max' in spec and value > spec['max']:
+                if high is not None and value > high:
                     return False
                 
                 # Check allowed values
-                if 'allowed' in spec and value not in spec['allowed']:
+                if allowed is not None and value not in allowed:
                     return False
         
         return True
     
     def _get_allowed_bands(self) -> List[tuple]:
         """Get allowed frequency bands based on compliance level"""
-        if self.compliance_level == ComplianceLevel.LAB:
+        if self._is_lab:
             return [
                 (1575.42e6 - 10e6, 1575.42e6 + 10e6),  # GPS L1
                 (2400e6, 2483.5e6),  # ISM band
@@ -213,16 +396,17 @@ class ComplianceMonitor:
     def monitor_gnss_operation(self) -> bool:
         """Monitor GNSS-SDR operations for compliance"""
         try:
-            # Check if GNSS-SDR is running in lab mode
-            with open('/etc/mnsf/gnss/active.conf', 'r') as f:
-                config = f.read()
+            # Check if GNSS-SDR is running in lab mode; rescan only when the config changes
+            st = os.stat(GNSS_CONFIG_PATH)
+            key = (st.st_mtime_ns, st.st_size)
             
-            checks = [
-                ('Lab mode enabled', 'LAB MODE ENABLED' in config),
-                ('Transmission disabled', 'enable_throttle_control=true' in config),
-                ('GPS L1 frequency', '1575420000' in config),
-                ('Compliance header present', 'Compliance Standards:' in config)
-            ]
+            if self._gnss_scan is not None and self._gnss_scan[0] == key:
+                checks = self._gnss_scan[1]
+            else:
+                with open(GNSS_CONFIG_PATH, 'rb') as f:
+                    config = f.read()
+                checks = self._scan_gnss_config(config)
+                self._gnss_scan = (key, checks)
             
             all_passed = all(passed for _, passed in checks)
             
@@ -231,12 +415,13 @@ class ComplianceMonitor:
                 logger.error(f"GNSS compliance checks failed: {failed}")
                 
                 # Log violation
-                self.violations.append({
-                    'module': 'gnss',
-                    'timestamp': datetime.now(timezone.utc).isoformat(),
-                    'failed_checks': failed,
-                    'action': 'shutdown_recommended'
-                })
+                with self._lock:
+                    self._record_violation({
+                        'module': 'gnss',
+                        'ts_ns': time.time_ns(),
+                        'failed_checks': failed,
+                        'action': 'shutdown_recommended'
+                    })
             
             return all_passed
             
@@ -244,32 +429,72 @@ class ComplianceMonitor:
             logger.error(f"GNSS monitoring error: {e}")
             return False
     
+    @classmethod
+    def _scan_gnss_config(cls, config: bytes) -> List[Tuple[str, bool]]:
+        """Match all GNSS config markers, in a single pass when Hyperscan is available"""
+        if hyperscan is None:
+            return [(name, marker in config) for name, marker in GNSS_CONFIG_CHECKS]
+        
+        if cls._gnss_marker_db is None:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[re.escape(marker) for _, marker in GNSS_CONFIG_CHECKS],
+                ids=list(range(len(GNSS_CONFIG_CHECKS))),
+                elements=len(GNSS_CONFIG_CHECKS),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(GNSS_CONFIG_CHECKS)
+            )
+            cls._gnss_marker_db = db
+        
+        found = set()
+        
+        def on_match(marker_id, start, end, flags, context):
+            found.add(marker_id)
+        
+        cls._gnss_marker_db.scan(config, match_event_handler=on_match)
+        return [(name, i in found) for i, (name, _) in enumerate(GNSS_CONFIG_CHECKS)]
+    
+    def _record_violation(self, violation: Dict):
+        """Append a violation to the retained history; caller holds the lock"""
+        if len(self.violations) == self.violations.maxlen:
+            evicted = self.violations[0]
+            self._violation_counts.subtract(v.get('rule_id', 'unknown') for v in evicted.get('violations', []))
+        
+        if 'operation' in violation:
+            self._recent_by_op[violation['operation']].append((self.violation_count, violation))
+        
+        self.violations.append(violation)
+        self.violation_count += 1
+        self._violation_counts.update(v.get('rule_id', 'unknown') for v in violation.get('violations', []))
+    
     def generate_compliance_report(self) -> Dict:
         """Generate comprehensive compliance report"""
-        report = {
-            'report_id': hashlib.md5(datetime.now().isoformat().encode()).hexdigest(),
-            'generated': datetime.now(timezone.utc).isoformat(),
-            'compliance_level': self.compliance_level.value,
-            'summary': {
-                'total_operations': len(self.operations_log),
-                'compliant_operations': sum(1 for op in self.operations_log if op['compliant']),
-                'non_compliant_operations': sum(1 for op in self.operations_log if not op['compliant']),
-                'total_violations': len(self.violations)
-            },
-            'regulatory_framework': {
-                'rules_loaded': len(self.rules),
-                'standards_loaded': self.standards['standards']
-            },
-            'operations_analysis': self.operations_log[-100:],  # Last 100 operations
-            'violations': self.violations[-50:],  # Last 50 violations
-            'recommendations': self._generate_recommendations()
-        }
+        with self._lock:
+            now_ns = time.time_ns()
+            report = {
+                'report_id': hashlib.sha256(now_ns.to_bytes(8, 'little')).hexdigest(),
+                'generated': _iso(now_ns),
+                'compliance_level': self.compliance_level.value,
+                'summary': {
+                    'total_operations': self.operation_count,
+                    'compliant_operations': self.compliant_count,
+                    'non_compliant_operations': self.operation_count - self.compliant_count,
+                    'total_violations': self.violation_count
+                },
+                'regulatory_framework': {
+                    'rules_loaded': len(self.rules),
+                    'standards_loaded': self.standards['standards']
+                },
+                'operations_analysis': [_export(op) for op in self.operations_log],  # Last 100 operations
+                'violations': [_export(v) for v in _tail(self.violations, 50)],  # Last 50 violations
+                'recommendations': self._generate_recommendations()
+            }
         
         # Save report
-        report_file = f'/var/log/mnsf/compliance_reports/report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime(now_ns // 1_000_000_000))
+        report_file = f'/var/log/mnsf/compliance_reports/report_{stamp}.json'
         
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        with open(report_file, 'wb') as f:
+            f.write(dump_json(report, indent=True))
         
         logger.info(f"Compliance report generated: {report_file}")
         return report
@@ -278,15 +503,8 @@ class ComplianceMonitor:
         """Generate recommendations based on violations"""
         recommendations = []
         
-        # Analyze violations
-        violation_counts = {}
-        for violation in self.violations:
-            for v in violation.get('violations', []):
-                rule_id = v.get('rule_id', 'unknown')
-                violation_counts[rule_id] = violation_counts.get(rule_id, 0) + 1
-        
         # Generate recommendations
-        for rule_id, count in violation_counts.items():
+        for rule_id, count in self._violation_counts.items():
             if count > 5:
                 recommendations.append(f"High frequency of {rule_id} violations ({count}x). Consider retraining.")
         
@@ -308,8 +526,9 @@ class ComplianceMonitor:
             }
         else:
             # Check if violations exceed thresholds
-            recent_violations = [v for v in self.violations[-10:] 
-                                if v.get('operation') == operation]
+            horizon = self.violation_count - ENFORCEMENT_WINDOW
+            recent_violations = [v for seq, v in self._recent_by_op.get(operation, ())
+                                 if seq >= horizon]
             
             if len(recent_violations) >= 3:
                 # Too many violations - block operation
@@ -317,7 +536,7 @@ class ComplianceMonitor:
                     'allowed': False,
                     'action': 'block',
                     'message': 'Operation blocked due to multiple violations',
-                    'violations': recent_violations
+                    'violations': [_export(v) for v in recent_violations]
                 }
             else:
                 # Allow with warning
@@ -325,9 +544,109 @@ class ComplianceMonitor:
                     'allowed': True,
                     'action': 'warn',
                     'message': 'Operation allowed with compliance warning',
-                    'violations': recent_violations
+                    'violations': [_export(v) for v in recent_violations]
                 }
 
+def handle_command(monitor: ComplianceMonitor, cmd: str) -> bool:
+    """Run an interactive command; returns False when the session should end"""
+    if cmd.startswith('check '):
+        module = cmd.split(' ', 1)[1]
+        if module == 'gnss':
+            compliant = monitor.monitor_gnss_operation()
+            print(f"GNSS: {'COMPLIANT' if compliant else 'NON-COMPLIANT'}")
+        else:
+            print(f"Unknown module: {module}")
+    
+    elif cmd == 'report':
+        report = monitor.generate_compliance_report()
+        print(f"Report generated: {report['report_id']}")
+        print(f"Summary: {report['summary']}")
+    
+    elif cmd == 'violations':
+        for i, violation in enumerate(_tail(monitor.violations, 5), 1):
+            print(f"{i}. {violation.get('module', 'unknown')} - "
+                  f"{_iso(violation['ts_ns'])}")
+    
+    elif cmd in ('exit', 'quit'):
+        return False
+    
+    else:
+        print("Unknown command")
+    
+    return True
+
+def run_event_loop(monitor: ComplianceMonitor, interval: Optional[float]):
+    """Serve stdin commands and, when an interval is given, periodic GNSS monitoring"""
+    interactive = interval is None
+    selector = selectors.DefaultSelector()
+    try:
+        fd = sys.stdin.fileno()
+    except (AttributeError, ValueError, OSError):
+        fd = None  # no usable stdin
+    try:
+        selector.register(fd, selectors.EVENT_READ)
+        stdin_open = True
+    except (TypeError, ValueError, OSError):
+        # stdin is missing or not pollable (e.g. a regular file)
+        stdin_open = False
+    
+    if interactive and fd is None:
+        return
+    
+    # stdin is read unbuffered so lines already read never hide behind select()
+    partial = b''
+    deadline = time.monotonic()
+    if interactive:
+        print("\ncompliance> ", end='', flush=True)
+    
+    try:
+        while True:
+            if not interactive and time.monotonic() >= deadline:
+                # Monitor GNSS operations
+                monitor.monitor_gnss_operation()
+                
+                # Generate periodic reports
+                if monitor.operation_count % 100 == 0:
+                    monitor.generate_compliance_report()
+                
+                deadline = max(deadline + interval, time.monotonic())
+            
+            if stdin_open:
+                timeout = None if interactive else max(0.0, deadline - time.monotonic())
+                ready = bool(selector.select(timeout))
+            elif interactive:
+                ready = True  # nothing else to wait for, so block on read
+            else:
+                time.sleep(max(0.0, deadline - time.monotonic()))
+                ready = False
+            
+            if not ready:
+                continue
+            
+            chunk = os.read(fd, 4096)
+            if chunk:
+                *lines, partial = (partial + chunk).split(b'\n')
+            else:
+                # EOF: an interactive session ends, a monitor keeps running
+                lines, partial = ([partial] if partial else []), b''
+                if stdin_open:
+                    selector.unregister(fd)
+                    stdin_open = False
+            
+            for line in lines:
+                try:
+                    if not handle_command(monitor, line.decode(errors='replace').strip().lower()):
+                        return
+                except Exception as e:
+                    print(f"Error: {e}")
+                if interactive:
+                    print("\ncompliance> ", end='', flush=True)
+            
+            if not chunk and interactive:
+                break
+    finally:
+        selector.close()
+
 def main():
     """Main compliance monitor daemon"""
     import argparse
@@ -368,20 +687,13 @@ def main():
         print("=" * 60)
         
         try:
-            while True:
-                # Monitor GNSS operations
-                monitor.monitor_gnss_operation()
-                
-                # Generate periodic reports
-                if len(monitor.operations_log) % 100 == 0:
-                    monitor.generate_compliance_report()
-                
-                time.sleep(args.interval)
-                
+            run_event_loop(monitor, args.interval)
         except KeyboardInterrupt:
-            print("\n[!] Stopping compliance monitor...")
-            final_report = monitor.generate_compliance_report()
-            print(f"[✓] Final report generated: {final_report['report_id']}")
+            pass
+        
+        print("\n[!] Stopping compliance monitor...")
+        final_report = monitor.generate_compliance_report()
+        print(f"[✓] Final report generated: {final_report['report_id']}")
     
     else:
         # Interactive mode
@@ -391,38 +703,10 @@ def main():
         print("  violations        - Show recent violations")
         print("  exit              - Exit program")
         
-        while True:
-            try:
-                cmd = input("\ncompliance> ").strip().lower()
-                
-                if cmd.startswith('check '):
-                    module = cmd.split(' ', 1)[1]
-                    if module == 'gnss':
-                        compliant = monitor.monitor_gnss_operation()
-                        print(f"GNSS: {'COMPLIANT' if compliant else 'NON-COMPLIANT'}")
-                    else:
-                        print(f"Unknown module: {module}")
-                
-                elif cmd == 'report':
-                    report = monitor.generate_compliance_report()
-                    print(f"Report generated: {report['report_id']}")
-                    print(f"Summary: {report['summary']}")
-                
-                elif cmd == 'violations':
-                    for i, violation in enumerate(monitor.violations[-5:], 1):
-                        print(f"{i}. {violation.get('module', 'unknown')} - "
-                              f"{violation.get('timestamp', 'unknown')}")
-                
-                elif cmd in ('exit', 'quit'):
-                    break
-                
-                else:
-                    print("Unknown command")
-                    
-            except KeyboardInterrupt:
-                break
-            except Exception as e:
-                print(f"Error: {e}")
+        try:
+            run_event_loop(monitor, None)
+        except KeyboardInterrupt:
+            pass
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+MNSF File I/O
+Config loading and JSON serialization shared by the framework, compliance monitor and modules
+"""
+
+import json
+import os
+import functools
+from datetime import datetime
+from typing import Any
+import numpy as np
+import yaml
+
+# Prefer the libyaml-backed loader; the pure Python one is much slower
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@functools.lru_cache(maxsize=8)
+def _parse_file(path: str, mtime_ns: int) -> Any:
+    """Parse a JSON or YAML file; cached per (path, mtime), so treat the result as read-only"""
+    if path.endswith('.json'):
+        with open(path, 'rb') as f:
+            data = f.read()
+        return orjson.loads(data) if orjson else json.loads(data)
+    
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+def load_file(path: str) -> Any:
+    """Load a config file, reparsing only after it changes on disk"""
+    return _parse_file(path, os.stat(path).st_mtime_ns)
+
+def load_config(path: str) -> Any:
+    """Load a YAML config, preferring an up-to-date JSON export next to it"""
+    json_path = os.path.splitext(path)[0] + '.json'
+    try:
+        json_mtime_ns = os.stat(json_path).st_mtime_ns
+        if json_mtime_ns >= os.stat(path).st_mtime_ns:
+            return _parse_file(json_path, json_mtime_ns)
+    except FileNotFoundError:
+        pass
+    
+    return load_file(path)
+
+def json_default(obj):
+    """Serialize values the stdlib encoder does not handle"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dump_json(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to JSON, using orjson when available"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=json_default, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=json_default).encode()
+
+def dumps_json(obj: Any, indent: bool = False) -> str:
+    """dump_json, decoded to text"""
+    return dump_json(obj, indent).decode()
@@ -5,8 +5,12 @@ Main framework orchestrator with compliance enforcement
 """
 
 import asyncio
-import json
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Optional
 import argparse
@@ -15,29 +19,58 @@ from enum import Enum
 import signal
 import sys
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Import modules
 from modules.gnss.gnss_sync import GNSSSyncManager
 from core.compliance_monitor import ComplianceMonitor
+from core.fileio import dumps_json
+
+# Configure logging: callers only enqueue records, a listener thread does the I/O
+_log_queue = queue.SimpleQueue()
+_log_formatter = logging.Formatter('%(asctime)s - MNSF - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('/var/log/mnsf/framework.log'),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+# force: the framework is the entry point and owns the root logger, even when an
+# imported module has already configured it
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler], force=True)
+
+_log_listener: Optional[logging.handlers.QueueListener] = logging.handlers.QueueListener(
+    _log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+
+def _stop_logging():
+    """Drain queued log records and stop the listener thread"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+atexit.register(_stop_logging)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - MNSF - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/var/log/mnsf/framework.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger('mnsf_core')
 
-class ModuleStatus(Enum):
+# Upper bound on memoized compliance results before the cache is reset
+COMPLIANCE_CACHE_SIZE = 1024
+
+class ModuleStatus(str, Enum):
     STOPPED = "stopped"
     STARTING = "starting"
     RUNNING = "running"
     ERROR = "error"
     COMPLIANCE_FAILED = "compliance_failed"
 
-@dataclass
+@dataclass(slots=True)
 class ModuleInfo:
     name: str
     status: ModuleStatus
@@ -45,6 +78,15 @@ class ModuleInfo:
     compliance_required: bool
     last_check: Optional[datetime] = None
 
+# Available modules: (name, description, compliance required)
+MODULE_SPECS = (
+    ('gnss', 'GNSS Synchronization and Timing', True),
+    ('sim_swap', 'SIM Swap Attack Simulation', True),
+    ('intercept', 'Signal Interception Analysis', True),
+    ('physical_layer', 'Physical Layer Attack Simulation', True),
+    ('compliance', 'Regulatory Compliance Monitoring', True)
+)
+
 class MNSFFramework:
     """Main MNSF Framework orchestrator"""
     
@@ -53,6 +95,15 @@ class MNSFFramework:
         self.compliance_monitor = ComplianceMonitor()
         self.gnss_sync: Optional[GNSSSyncManager] = None
         self.running = False
+        self._compliance_cache: set = set()
+        self._bg_tasks: set = set()  # background module work, cancelled on shutdown
+        self._shutdown_event = asyncio.Event()
+        
+        # Module-specific start routines; other modules only change status
+        self._starters = {
+            'gnss': self.start_gnss_module,
+            'compliance': self.start_compliance_module
+        }
         
         self.register_modules()
         logger.info("MNSF Framework initialized")
@@ -60,75 +111,98 @@ class MNSFFramework:
     def register_modules(self):
         """Register all available modules"""
         self.modules = {
-            'gnss': ModuleInfo(
-                name='gnss',
-                status=ModuleStatus.STOPPED,
-                description='GNSS Synchronization and Timing',
-                compliance_required=True
-            ),
-            'sim_swap': ModuleInfo(
-                name='sim_swap',
-                status=ModuleStatus.STOPPED,
-                description='SIM Swap Attack Simulation',
-                compliance_required=True
-            ),
-            'intercept': ModuleInfo(
-                name='intercept',
-                status=ModuleStatus.STOPPED,
-                description='Signal Interception Analysis',
-                compliance_required=True
-            ),
-            'physical_layer': ModuleInfo(
-                name='physical_layer',
-                status=ModuleStatus.STOPPED,
-                description='Physical Layer Attack Simulation',
-                compliance_required=True
-            ),
-            'compliance': ModuleInfo(
-                name='compliance',
-                status=ModuleStatus.RUNNING,
-                description='Regulatory Compliance Monitoring',
-                compliance_required=True
+            name: ModuleInfo(
+                name=name,
+                status=ModuleStatus.RUNNING if name == 'compliance' else ModuleStatus.STOPPED,
+                description=description,
+                compliance_required=compliance_required
             )
+            for name, description, compliance_required in MODULE_SPECS
+        }
+        
+        # Names of running modules, in start order (dict used as an ordered set)
+        self._running: Dict[str, None] = {
+            name: None for name, module in self.modules.items()
+            if module.status is ModuleStatus.RUNNING
+        }
+        
+        # Fields that never change, merged into every status snapshot
+        self._module_static = {
+            name: {'name': module.name, 'description': module.description}
+            for name, module in self.modules.items()
         }
     
+    def _set_status(self, module_name: str, status: ModuleStatus):
+        """Update a module's status, keeping the running set in step"""
+        self.modules[module_name].status = status
+        if status is ModuleStatus.RUNNING:
+            self._running[module_name] = None
+        else:
+            self._running.pop(module_name, None)
+    
+    @property
+    def running_modules(self) -> List[str]:
+        """Names of the modules currently running"""
+        return list(self._running)
+    
+    def _check_compliance(self, operation: str, parameters: Dict) -> bool:
+        """Check an operation, reusing earlier passes for identical requests"""
+        try:
+            key = (operation, frozenset(parameters.items()))
+        except TypeError:
+            # Unhashable parameter values cannot be memoized
+            return self.compliance_monitor.check_operation(operation, parameters)
+        
+        if key in self._compliance_cache:
+            return True
+        
+        compliant = self.compliance_monitor.check_operation(operation, parameters)
+        # Only passes are memoized so every violation is still evaluated and recorded
+        if compliant:
+            if len(self._compliance_cache) >= COMPLIANCE_CACHE_SIZE:
+                self._compliance_cache.clear()
+            self._compliance_cache.add(key)
+        return compliant
+    
+    def clear_compliance_cache(self):
+        """Drop memoized compliance results after a state change"""
+        self._compliance_cache.clear()
+    
     async def start_module(self, module_name: str, **kwargs) -> bool:
         """Start a module with compliance check"""
         if module_name not in self.modules:
-            logger.error(f"Unknown module: {module_name}")
+            logger.error("Unknown module: %s", module_name)
             return False
         
         module = self.modules[module_name]
         
         # Check compliance
         if module.compliance_required:
-            logger.info(f"Checking compliance for {module_name}...")
+            logger.info("Checking compliance for %s...", module_name)
             
-            if not self.compliance_monitor.check_operation(
-                f"start_{module_name}", kwargs):
-                logger.error(f"Compliance check failed for {module_name}")
-                module.status = ModuleStatus.COMPLIANCE_FAILED
+            if not self._check_compliance(f"start_{module_name}", kwargs):
+                logger.error("Compliance check failed for %s", module_name)
+                self._set_status(module_name, ModuleStatus.COMPLIANCE_FAILED)
+                self.clear_compliance_cache()
                 return False
         
         # Update status
-        module.status = ModuleStatus.STARTING
+        self._set_status(module_name, ModuleStatus.STARTING)
         module.last_check = datetime.now()
         
         try:
             # Start the module
-            if module_name == 'gnss':
-                await self.start_gnss_module(**kwargs)
-            elif module_name == 'compliance':
-                await self.start_compliance_module(**kwargs)
-            # Other modules would be started here
+            starter = self._starters.get(module_name)
+            if starter:
+                await starter(**kwargs)
             
-            module.status = ModuleStatus.RUNNING
-            logger.info(f"Module {module_name} started successfully")
+            self._set_status(module_name, ModuleStatus.RUNNING)
+            logger.info("Module %s started successfully", module_name)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to start module {module_name}: {e}")
-            module.status = ModuleStatus.ERROR
+            logger.error("Failed to start module %s: %s", module_name, e)
+            self._set_status(module_name, ModuleStatus.ERROR)
             return False
     
     async def start_gnss_module(self, **kwargs):
@@ -138,15 +212,7 @@ class MNSFFramework:
         # Initialize GNSS sync manager
         self.gnss_sync = GNSSSyncManager()
         
-        # Start sync in background
-        # Note: In production, this would be properly async
-        import threading
-        def run_gnss():
-            # This would normally run the GNSS sync loop
-            pass
-        
-        thread = threading.Thread(target=run_gnss, daemon=True)
-        thread.start()
+        # The GNSS sync loop would be scheduled here with _spawn()
         
         logger.info("GNSS module started")
     
@@ -155,62 +221,63 @@ class MNSFFramework:
         logger.info("Starting compliance monitoring...")
         
         # Compliance monitor runs in background
-        import threading
-        def run_compliance():
-            self.compliance_monitor.monitor_gnss_operation()
-        
-        thread = threading.Thread(target=run_compliance, daemon=True)
-        thread.start()
+        self._spawn(asyncio.to_thread(self.compliance_monitor.monitor_gnss_operation))
         
         logger.info("Compliance monitoring started")
     
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background, tracked until it completes"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+    
     async def stop_module(self, module_name: str) -> bool:
         """Stop a module"""
         if module_name not in self.modules:
             return False
         
-        module = self.modules[module_name]
-        module.status = ModuleStatus.STOPPED
+        self._set_status(module_name, ModuleStatus.STOPPED)
+        self.clear_compliance_cache()
         
         # Module-specific cleanup
         if module_name == 'gnss' and self.gnss_sync:
             # Cleanup GNSS
             pass
         
-        logger.info(f"Module {module_name} stopped")
+        logger.info("Module %s stopped", module_name)
         return True
     
     async def get_status(self) -> Dict:
         """Get framework status"""
         status = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now(),
             'framework': 'MNSF',
             'version': '1.0.0',
             'running': self.running,
-            'modules': {},
+            'modules': {
+                name: {
+                    **self._module_static[name],
+                    'status': module.status,
+                    'last_check': module.last_check
+                }
+                for name, module in self.modules.items()
+            },
             'compliance': {
                 'level': self.compliance_monitor.compliance_level.value,
-                'operations': len(self.compliance_monitor.operations_log),
-                'violations': len(self.compliance_monitor.violations)
+                'operations': self.compliance_monitor.operation_count,
+                'violations': self.compliance_monitor.violation_count
             }
         }
         
-        for name, module in self.modules.items():
-            status['modules'][name] = {
-                'name': module.name,
-                'status': module.status.value,
-                'description': module.description,
-                'last_check': module.last_check.isoformat() if module.last_check else None
-            }
-        
         return status
     
     async def run_test_scenario(self, scenario: str) -> Dict:
         """Run a test scenario with compliance monitoring"""
-        logger.info(f"Starting test scenario: {scenario}")
+        logger.info("Starting test scenario: %s", scenario)
         
         # Check compliance for scenario
-        if not self.compliance_monitor.check_operation(f"scenario_{scenario}", {}):
+        if not self._check_compliance(f"scenario_{scenario}", {}):
             return {
                 'success': False,
                 'error': 'Compliance check failed',
@@ -241,15 +308,15 @@ class MNSFFramework:
             }
         
         # Get sync info
-        sync_info = self.gnss_sync.get_sync_info()
+        sync_info = await asyncio.to_thread(self.gnss_sync.get_sync_info)
         
         # Generate 3GPP test report
-        test_report = self.gnss_sync.generate_3gpp_test_report()
+        test_report = await asyncio.to_thread(self.gnss_sync.generate_3gpp_test_report)
         
         return {
             'success': True,
             'test': 'gnss_sync',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now(),
             'sync_info': sync_info,
             'test_report_id': test_report.get('test_id', 'unknown'),
             'compliance': sync_info['compliance']
@@ -259,19 +326,23 @@ class MNSFFramework:
         """Run comprehensive compliance audit"""
         logger.info("Running compliance audit...")
         
-        # Check all modules
-        module_status = {}
-        for name, module in self.modules.items():
-            if module.compliance_required:
-                compliant = self.compliance_monitor.check_operation(
-                    f"audit_{name}", {})
-                module_status[name] = {
-                    'compliant': compliant,
-                    'status': module.status.value
-                }
+        # Check all modules concurrently
+        audited = [(name, module) for name, module in self.modules.items()
+                   if module.compliance_required]
+        results = await asyncio.gather(*(
+            asyncio.to_thread(self._check_compliance, f"audit_{name}", {})
+            for name, _ in audited
+        ))
+        module_status = {
+            name: {
+                'compliant': compliant,
+                'status': module.status
+            }
+            for (name, module), compliant in zip(audited, results)
+        }
         
         # Generate compliance report
-        report = self.compliance_monitor.generate_compliance_report()
+        report = await asyncio.to_thread(self.compliance_monitor.generate_compliance_report)
         
         # Check if any module is non-compliant
         all_compliant = all(status['compliant'] for status in module_status.values())
@@ -279,32 +350,199 @@ class MNSFFramework:
         return {
             'success': all_compliant,
             'audit': 'compliance',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now(),
             'module_status': module_status,
             'report_id': report['report_id'],
             'summary': report['summary']
         }
     
+    def request_shutdown(self):
+        """Ask the running session to stop; safe to call from signal handlers"""
+        self._shutdown_event.set()
+    
+    @property
+    def shutdown_requested(self) -> bool:
+        """Whether a shutdown has been requested"""
+        return self._shutdown_event.is_set()
+    
+    async def wait_for_shutdown(self):
+        """Block until a shutdown is requested"""
+        await self._shutdown_event.wait()
+    
     async def shutdown(self):
         """Gracefully shutdown the framework"""
         logger.info("Shutting down MNSF framework...")
         
         self.running = False
         
+        # Cancel background work
+        for task in self._bg_tasks:
+            task.cancel()
+        await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+        
         # Stop all modules
         for module_name in self.modules:
             await self.stop_module(module_name)
         
         # Generate final compliance report
         if self.compliance_monitor:
-            self.compliance_monitor.generate_compliance_report()
+            await asyncio.to_thread(self.compliance_monitor.generate_compliance_report)
         
         logger.info("MNSF framework shutdown complete")
+        _stop_logging()
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals"""
-    logger.info(f"Received signal {signum}, shutting down...")
-    sys.exit(0)
+class StdinReader:
+    """Line reader for stdin that waits on the event loop instead of blocking it"""
+    
+    def __init__(self):
+        self._fd = sys.stdin.fileno()
+        self._lines: deque = deque()
+        self._partial = b''
+        self._eof = False
+    
+    async def _read(self) -> bytes:
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        try:
+            loop.add_reader(self._fd, lambda: ready.done() or ready.set_result(None))
+        except (NotImplementedError, ValueError, OSError):
+            # stdin cannot be polled (e.g. a regular file); read it in a worker thread
+            return await asyncio.to_thread(os.read, self._fd, 4096)
+        try:
+            await ready
+        finally:
+            loop.remove_reader(self._fd)
+        return os.read(self._fd, 4096)
+    
+    async def readline(self, prompt: str = '') -> str:
+        """Print a prompt and return the next line, raising EOFError at end of input"""
+        print(prompt, end='', flush=True)
+        while not self._lines:
+            if self._eof:
+                raise EOFError
+            chunk = await self._read()
+            if not chunk:
+                self._eof = True
+                if self._partial:
+                    self._lines.append(self._partial)
+                    self._partial = b''
+                continue
+            *lines, self._partial = (self._partial + chunk).split(b'\n')
+            self._lines.extend(lines)
+        return self._lines.popleft().decode(errors='replace')
+
+async def _repl_start(framework: MNSFFramework, module: str):
+    success = await framework.start_module(module)
+    print(f"Module {module}: {'STARTED' if success else 'FAILED'}")
+
+async def _repl_stop(framework: MNSFFramework, module: str):
+    success = await framework.stop_module(module)
+    print(f"Module {module}: {'STOPPED' if success else 'FAILED'}")
+
+async def _repl_status(framework: MNSFFramework):
+    status = await framework.get_status()
+    print(dumps_json(status, indent=True))
+
+async def _repl_scenario(framework: MNSFFramework, scenario: str):
+    result = await framework.run_test_scenario(scenario)
+    print(dumps_json(result, indent=True))
+
+async def _repl_compliance(framework: MNSFFramework):
+    report = await asyncio.to_thread(framework.compliance_monitor.generate_compliance_report)
+    print(f"Compliance report: {report['report_id']}")
+    print(f"Violations: {report['summary']['total_violations']}")
+
+# Interactive commands: name -> (handler, number of required arguments)
+REPL_COMMANDS = {
+    'start': (_repl_start, 1),
+    'stop': (_repl_stop, 1),
+    'status': (_repl_status, 0),
+    'scenario': (_repl_scenario, 1),
+    'compliance': (_repl_compliance, 0)
+}
+
+async def run_session(framework: MNSFFramework, args: argparse.Namespace):
+    """Run the mode selected on the command line"""
+    if args.start_all:
+        print("[+] Starting all modules...")
+        
+        # Start compliance first
+        await framework.start_module('compliance')
+        
+        # Start GNSS
+        await framework.start_module('gnss')
+        
+        # Update status
+        framework.running = True
+    
+    elif args.module:
+        print(f"[+] Starting module: {args.module}")
+        success = await framework.start_module(args.module)
+        if success:
+            print(f"[✓] Module {args.module} started")
+        else:
+            print(f"[!] Failed to start module {args.module}")
+    
+    elif args.scenario:
+        print(f"[+] Running scenario: {args.scenario}")
+        result = await framework.run_test_scenario(args.scenario)
+        print(dumps_json(result, indent=True))
+    
+    elif args.status:
+        status = await framework.get_status()
+        print(dumps_json(status, indent=True))
+    
+    elif args.compliance_report:
+        print("[+] Generating compliance report...")
+        report = await asyncio.to_thread(
+            framework.compliance_monitor.generate_compliance_report)
+        print(f"[✓] Report generated: {report['report_id']}")
+    
+    else:
+        # Interactive mode
+        print("\nAvailable commands:")
+        print("  start <module>    - Start a module")
+        print("  stop <module>     - Stop a module")
+        print("  status           - Show framework status")
+        print("  scenario <name>  - Run test scenario")
+        print("  compliance       - Generate compliance report")
+        print("  exit             - Shutdown framework")
+        
+        stdin = StdinReader()
+        while True:
+            try:
+                cmd = (await stdin.readline("\nmnsf> ")).strip().lower().split()
+                
+                if not cmd:
+                    continue
+                
+                if cmd[0] in ('exit', 'quit'):
+                    break
+                
+                handler, arity = REPL_COMMANDS.get(cmd[0], (None, 0))
+                if handler and len(cmd) > arity:
+                    await handler(framework, *cmd[1:1 + arity])
+                else:
+                    print("Unknown command")
+            
+            except EOFError:
+                break
+            except Exception as e:
+                print(f"Error: {e}")
+    
+    # If started automatically, keep running
+    if args.start_all:
+        print("\n[✓] MNSF Framework running")
+        print("Modules active:")
+        for name in framework.running_modules:
+            print(f"  • {name}: {framework.modules[name].description}")
+        
+        print("\nPress Ctrl+C to shutdown")
+        print("=" * 60)
+        
+        # Keep framework running until a shutdown signal
+        framework.running = True
+        await framework.wait_for_shutdown()
 
 async def main():
     """Main framework entry point"""
@@ -322,120 +560,30 @@ async def main():
     print("3GPP Compliant Testing Framework")
     print("=" * 60)
     
-    # Set up signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
     # Initialize framework
     framework = MNSFFramework()
     
-    try:
-        if args.start_all:
-            print("[+] Starting all modules...")
-            
-            # Start compliance first
-            await framework.start_module('compliance')
-            
-            # Start GNSS
-            await framework.start_module('gnss')
-            
-            # Update status
-            framework.running = True
-            
-        elif args.module:
-            print(f"[+] Starting module: {args.module}")
-            success = await framework.start_module(args.module)
-            if success:
-                print(f"[✓] Module {args.module} started")
-            else:
-                print(f"[!] Failed to start module {args.module}")
-        
-        elif args.scenario:
-            print(f"[+] Running scenario: {args.scenario}")
-            result = await framework.run_test_scenario(args.scenario)
-            print(json.dumps(result, indent=2))
-        
-        elif args.status:
-            status = await framework.get_status()
-            print(json.dumps(status, indent=2))
-        
-        elif args.compliance_report:
-            print("[+] Generating compliance report...")
-            report = framework.compliance_monitor.generate_compliance_report()
-            print(f"[✓] Report generated: {report['report_id']}")
-        
-        else:
-            # Interactive mode
-            print("\nAvailable commands:")
-            print("  start <module>    - Start a module")
-            print("  stop <module>     - Stop a module")
-            print("  status           - Show framework status")
-            print("  scenario <name>  - Run test scenario")
-            print("  compliance       - Generate compliance report")
-            print("  exit             - Shutdown framework")
-            
-            while True:
-                try:
-                    cmd = input("\nmnsf> ").strip().lower().split()
-                    
-                    if not cmd:
-                        continue
-                    
-                    if cmd[0] == 'start' and len(cmd) > 1:
-                        module = cmd[1]
-                        success = await framework.start_module(module)
-                        print(f"Module {module}: {'STARTED' if success else 'FAILED'}")
-                    
-                    elif cmd[0] == 'stop' and len(cmd) > 1:
-                        module = cmd[1]
-                        success = await framework.stop_module(module)
-                        print(f"Module {module}: {'STOPPED' if success else 'FAILED'}")
-                    
-                    elif cmd[0] == 'status':
-                        status = await framework.get_status()
-                        print(json.dumps(status, indent=2))
-                    
-                    elif cmd[0] == 'scenario' and len(cmd) > 1:
-                        scenario = cmd[1]
-                        result = await framework.run_test_scenario(scenario)
-                        print(json.dumps(result, indent=2))
-                    
-                    elif cmd[0] == 'compliance':
-                        report = framework.compliance_monitor.generate_compliance_report()
-                        print(f"Compliance report: {report['report_id']}")
-                        print(f"Violations: {report['summary']['total_violations']}")
-                    
-                    elif cmd[0] in ('exit', 'quit'):
-                        break
-                    
-                    else:
-                        print("Unknown command")
-                        
-                except KeyboardInterrupt:
-                    break
-                except Exception as e:
-                    print(f"Error: {e}")
-        
-        # If started automatically, keep running
-        if args.start_all:
-            print("\n[✓] MNSF Framework running")
-            print("Modules active:")
-            for name, module in framework.modules.items():
-                if module.status.value == 'running':
-                    print(f"  • {name}: {module.description}")
-            
-            print("\nPress Ctrl+C to shutdown")
-            print("=" * 60)
-            
-            # Keep framework running
-            framework.running = True
-            while framework.running:
-                await asyncio.sleep(1)
+    # Shutdown signals are handled on the loop so cleanup always runs
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, framework.request_shutdown)
     
-    except KeyboardInterrupt:
-        print("\n[!] Shutdown requested")
+    session = asyncio.create_task(run_session(framework, args))
+    stopper = asyncio.create_task(framework.wait_for_shutdown())
+    try:
+        await asyncio.wait({session, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        if framework.shutdown_requested:
+            print("\n[!] Shutdown requested")
+            session.cancel()
+        await session
+    except asyncio.CancelledError:
+        if not framework.shutdown_requested:
+            raise
     finally:
+        stopper.cancel()
         await framework.shutdown()
 
 if __name__ == "__main__":
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
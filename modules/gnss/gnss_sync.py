@@ -5,17 +5,29 @@ Provides precise timing synchronization for mobile network testing
 Compliant with 3GPP TS 36.133 and TS 25.133
 """
 
-import json
+import math
+import os
+import atexit
 import time
+import ctypes
 import socket
 import struct
 import threading
+import signal
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from typing import Optional, Dict, List, Tuple
 import numpy as np
 from enum import Enum
 import logging
+import sys
+
+# Run as a script, only modules/gnss/ is on sys.path; shared helpers import from the repository root
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.fileio import dump_json, dumps_json, load_config
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +40,142 @@ logging.basicConfig(
 )
 logger = logging.getLogger('gnss_sync')
 
+VIOLATIONS_LOG = '/var/log/mnsf/compliance_violations.json'
+REPORT_DIR = '/var/data/mnsf/gnss'
+COMPLIANCE_FILE = '/app/configs/global_regulations.yaml'
+
+NTP_EPOCH_OFFSET = 2208988800  # seconds from 1900-01-01 (NTP epoch) to 1970-01-01
+GPS_EPOCH_OFFSET = 315964800  # seconds from 1970-01-01 to 1980-01-06 (GPS epoch)
+NTP_PORT = 123
+NTP_PACKET_SIZE = 48  # NTPv4 header without extension fields
+NTP_BATCH = 64  # datagrams handled per recvmmsg/sendmmsg call
+
+# Response bytes that are the same in every reply: header word 0 and the
+# root delay/dispersion/reference ID words stay as set here
+NTP_RESPONSE_TEMPLATE = np.zeros(NTP_PACKET_SIZE, dtype=np.uint8)
+NTP_RESPONSE_TEMPLATE[0] = 0x24  # Version 4, server mode
+
+# An NTP timestamp field; a (k, 48) packet array viewed as this dtype is (k, 6),
+# with reference, origin, receive and transmit timestamps in columns 2-5
+NTP_TIMESTAMP_DTYPE = np.dtype([('s', '>u4'), ('f', '>u4')])
+
+# PTP (IEEE 1588-2008) over Ethernet
+ETH_P_1588 = 0x88F7
+PTP_SYNC_INTERVAL = 0.125  # seconds between Sync messages (logSyncInterval -3)
+PTP_ANNOUNCE_TICKS = 8  # Sync ticks per Announce message (logAnnounceInterval 0)
+PTP_SYNC_SIZE = 44  # Sync and Follow_Up
+PTP_ANNOUNCE_SIZE = 64
+TAI_GPS_OFFSET = 19  # seconds TAI is ahead of GPS time
+
+# Sync status thresholds, applied to Kalman-filtered receiver estimates
+LOCK_QUALITY = 0.98
+TRACK_QUALITY = 0.9
+LOCK_UNCERTAINTY_NS = 50.0
+LOCK_HYSTERESIS_NS = 10.0  # a lock is held until uncertainty exceeds 60 ns
+HISTORY_SIZE = 1024  # GNSS samples kept for stability statistics
+
+SOCKADDR_SIZE = 16  # sizeof(struct sockaddr_in)
+SOCKADDR_LL_SIZE = 20  # sizeof(struct sockaddr_ll)
+MSG_WAITFORONE = 0x10000
+
+# Kernel packet timestamping (linux/net_tstamp.h); SCM_TIMESTAMPING carries
+# struct timespec[3] = {software, deprecated, raw hardware}
+SO_TIMESTAMPING = SCM_TIMESTAMPING = 37
+SOF_TIMESTAMPING_RX_SOFTWARE = 1 << 3
+SOF_TIMESTAMPING_SOFTWARE = 1 << 4
+CMSG_HEADER_SIZE = socket.CMSG_LEN(0)
+TIMESTAMPING_CMSG_SPACE = socket.CMSG_SPACE(3 * 16)
+
+# Socket receive-queue drop counter, reported as a u32 control message after
+# the timestamp once the socket has dropped anything (asm-generic/socket.h)
+SO_RXQ_OVFL = 40
+RXQ_OVFL_CMSG_SPACE = socket.CMSG_SPACE(4)
+NTP_CMSG_SPACE = TIMESTAMPING_CMSG_SPACE + RXQ_OVFL_CMSG_SPACE
+
+# NTP socket buffers sized for request bursts; the *FORCE options
+# (CAP_NET_ADMIN) may exceed net.core.rmem_max/wmem_max
+SO_SNDBUFFORCE = 32
+SO_RCVBUFFORCE = 33
+NTP_RCVBUF = 8 * 1024 * 1024
+NTP_SNDBUF = 4 * 1024 * 1024
+
+# Classic BPF for SO_REUSEPORT: "return the current CPU", which selects the
+# group's socket with that index (linux/filter.h, as in reuseport_bpf_cpu.c)
+SO_ATTACH_REUSEPORT_CBPF = 51
+SKF_AD_CPU = 0xfffff000 + 36  # SKF_AD_OFF + SKF_AD_CPU
+BPF_LD_W_ABS = 0x20
+BPF_RET_A = 0x16
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_name', ctypes.c_void_p),
+        ('msg_namelen', ctypes.c_uint32),
+        ('msg_iov', ctypes.c_void_p),
+        ('msg_iovlen', ctypes.c_size_t),
+        ('msg_control', ctypes.c_void_p),
+        ('msg_controllen', ctypes.c_size_t),
+        ('msg_flags', ctypes.c_int)
+    ]
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', _MsgHdr), ('msg_len', ctypes.c_uint)]
+
+class _SockFilter(ctypes.Structure):
+    _fields_ = [
+        ('code', ctypes.c_uint16),
+        ('jt', ctypes.c_uint8),
+        ('jf', ctypes.c_uint8),
+        ('k', ctypes.c_uint32)
+    ]
+
+class _SockFprog(ctypes.Structure):
+    _fields_ = [('len', ctypes.c_ushort), ('filter', ctypes.c_void_p)]
+
+# NumPy view of the mmsghdr fields the kernel reads or updates per message
+_MMSGHDR_DTYPE = np.dtype({
+    'names': ['msg_namelen', 'msg_controllen', 'msg_len'],
+    'formats': [np.uint32, np.uintp, np.uintc],
+    'offsets': [_MsgHdr.msg_namelen.offset, _MsgHdr.msg_controllen.offset, _MMsgHdr.msg_len.offset],
+    'itemsize': ctypes.sizeof(_MMsgHdr)
+})
+_IOVEC_DTYPE = np.dtype([('iov_base', np.uintp), ('iov_len', np.uintp)])
+
+def _cmsg_dtype(offset: int, row_size: int) -> np.dtype:
+    """Record dtype for the control message at offset in each control buffer row"""
+    data = offset + CMSG_HEADER_SIZE
+    fields = [('cmsg_level', np.int32, offset + 8), ('cmsg_type', np.int32, offset + 12),
+              ('u32', np.uint32, data), ('tv_sec', np.int64, data), ('tv_nsec', np.int64, data + 8)]
+    fields = [f for f in fields if f[2] + np.dtype(f[1]).itemsize <= row_size]
+    return np.dtype({
+        'names': [f[0] for f in fields],
+        'formats': [f[1] for f in fields],
+        'offsets': [f[2] for f in fields],
+        'itemsize': row_size
+    })
+
+# Batched datagram syscalls (Linux); the servers fall back to recvmsg/sendto without them
+try:
+    _libc = ctypes.CDLL(None, use_errno=True)
+    _recvmmsg = _libc.recvmmsg
+    _sendmmsg = _libc.sendmmsg
+except (OSError, TypeError, AttributeError):
+    _recvmmsg = _sendmmsg = None
+else:
+    _recvmmsg.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    _recvmmsg.restype = ctypes.c_int
+    _sendmmsg.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
+    _sendmmsg.restype = ctypes.c_int
+
+def _check_syscall(result: int) -> int:
+    """Raise OSError for a failed libc call"""
+    if result < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    return result
+
 class SyncStatus(Enum):
     """GNSS synchronization status"""
     UNLOCKED = 0
@@ -46,7 +194,54 @@ class Constellation(Enum):
     QZSS = 'QZSS'
     IRNSS = 'IRNSS'
 
-@dataclass
+@dataclass(slots=True)
+class ScalarKalman:
+    """Random-walk scalar Kalman filter for smoothing receiver estimates"""
+    x: float  # state estimate
+    p: float  # estimate variance
+    q: float  # process noise per update
+    r: float  # measurement noise
+    
+    def update(self, z: float) -> float:
+        """Fold in measurement z and return the new estimate"""
+        p = self.p + self.q
+        k = p / (p + self.r)
+        self.x += k * (z - self.x)
+        self.p = p * (1 - k)
+        return self.x
+
+@dataclass(slots=True)
+class RollingStats:
+    """Welford mean/variance over a sliding window, updated in O(1) per sample"""
+    mean: float = 0.0
+    m2: float = 0.0  # sum of squared deviations from the mean
+    n: int = 0
+    
+    def add(self, x: float):
+        """Include sample x"""
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+    
+    def remove(self, x: float):
+        """Exclude a sample x previously added"""
+        if self.n <= 1:
+            self.mean = self.m2 = 0.0
+            self.n = 0
+            return
+        self.n -= 1
+        d = x - self.mean
+        self.mean -= d / self.n
+        self.m2 -= d * (x - self.mean)
+    
+    def std(self) -> float:
+        """Sample standard deviation; 0 with fewer than two samples"""
+        if self.n < 2:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / (self.n - 1))
+
+@dataclass(slots=True, frozen=True)
 class TimeData:
     """Precise time data structure"""
     gps_time: float  # GPS time in seconds
@@ -55,7 +250,7 @@ class TimeData:
     time_quality: float  # 0-1, 1 being perfect
     uncertainty_ns: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PositionData:
     """Position data structure"""
     latitude: float  # degrees
@@ -68,40 +263,261 @@ class PositionData:
     hdop: float  # Horizontal DOP
     vdop: float  # Vertical DOP
 
+def _ntp_timestamp(unix_ns: int) -> Tuple[int, int]:
+    """Split a Unix time in nanoseconds into NTP (seconds, fraction) fields"""
+    seconds, ns = divmod(unix_ns, 1_000_000_000)
+    return seconds + NTP_EPOCH_OFFSET, (ns << 32) // 1_000_000_000
+
+def _ntp_timestamps(unix_ns: np.ndarray, out: np.ndarray):
+    """Vectorized _ntp_timestamp: write (k,) nanoseconds into (k,) NTP_TIMESTAMP_DTYPE fields"""
+    seconds, ns = np.divmod(unix_ns.astype(np.uint64), np.uint64(1_000_000_000))
+    out['s'] = seconds + NTP_EPOCH_OFFSET  # byteswapped on assignment
+    out['f'] = (ns << 32) // 1_000_000_000
+
+_iso_second: Tuple[int, str] = (-1, '')  # last formatted UTC second
+
+def _utc_now_iso() -> str:
+    """Current UTC time in ISO 8601, formatting the date and time part once per second"""
+    global _iso_second
+    second, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached = _iso_second
+    if cached[0] != second:
+        cached = _iso_second = (second, time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second)))
+    return f"{cached[1]}.{ns // 1000:06d}+00:00"
+
+def _write_report(path: str, report: Dict):
+    """Write a test report to disk; runs on the report writer thread"""
+    try:
+        with open(path, 'wb') as f:
+            f.write(dump_json(report, indent=True))
+        logger.info(f"3GPP test report generated: {path}")
+    except Exception as e:
+        logger.error(f"Failed to write test report {path}: {e}")
+
+_report_exec: Optional[ThreadPoolExecutor] = None  # shared by every manager, started on the first report
+_report_exec_lock = threading.Lock()
+
+def _submit_report(path: str, report: Dict):
+    """Queue a test report for _write_report on the shared writer thread"""
+    global _report_exec
+    with _report_exec_lock:
+        if _report_exec is None:
+            _report_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gnss-report')
+        _report_exec.submit(_write_report, path, report)
+
+_violation_log = None  # shared by every manager, opened on the first violation
+_violation_lock = threading.Lock()
+
+def _append_violation(record: Dict):
+    """Append a violation record to VIOLATIONS_LOG as one JSON line"""
+    global _violation_log
+    with _violation_lock:
+        if _violation_log is None:
+            # Line buffered: each record reaches the file as soon as it is written
+            _violation_log = open(VIOLATIONS_LOG, 'a', buffering=1)
+            atexit.register(_violation_log.close)
+        _violation_log.write(dumps_json(record) + '\n')
+
+def _scm_rx_timestamp(ancdata: List[Tuple[int, int, bytes]]) -> int:
+    """Kernel receive time (ns) from recvmsg ancillary data, 0 when absent"""
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == SCM_TIMESTAMPING and len(data) >= 16:
+            sec, nsec = struct.unpack_from('@qq', data)
+            return sec * 1_000_000_000 + nsec
+    return 0
+
+def _scm_rxq_ovfl(ancdata: List[Tuple[int, int, bytes]]) -> int:
+    """Socket drop counter from recvmsg ancillary data, 0 when absent"""
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == SO_RXQ_OVFL and len(data) >= 4:
+            return struct.unpack_from('@I', data)[0]
+    return 0
+
+def _set_buffer_size(sock: socket.socket, force_option: int, option: int, size: int):
+    """Set a socket buffer size, falling back to the limit-capped option without CAP_NET_ADMIN"""
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, force_option, size)
+    except OSError:
+        sock.setsockopt(socket.SOL_SOCKET, option, size)
+
+def _attach_cpu_steering(sock: socket.socket):
+    """Steer each datagram to the reuseport socket whose index is the receiving CPU"""
+    program = (_SockFilter * 2)(
+        _SockFilter(BPF_LD_W_ABS, 0, 0, SKF_AD_CPU),
+        _SockFilter(BPF_RET_A, 0, 0, 0)
+    )
+    fprog = _SockFprog(len(program), ctypes.addressof(program))
+    sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_REUSEPORT_CBPF, bytes(fprog))
+
+def _ptp_message(message_type: int, length: int, control: int, log_interval: int,
+                 flags: int = 0) -> bytearray:
+    """Zeroed PTPv2 message with the header fields that never change"""
+    message = bytearray(length)
+    struct.pack_into('!BBHxxH', message, 0, 0x10 | message_type, 0x02, length, flags)
+    struct.pack_into('!Bb', message, 32, control, log_interval)
+    return message
+
+PTP_SYNC_TEMPLATE = _ptp_message(0x0, PTP_SYNC_SIZE, 0, -3, flags=0x0200)  # two-step
+PTP_FOLLOW_UP_TEMPLATE = _ptp_message(0x8, PTP_SYNC_SIZE, 2, -3)
+PTP_ANNOUNCE_TEMPLATE = _ptp_message(0xB, PTP_ANNOUNCE_SIZE, 5, 0, flags=0x000C)  # PTP timescale, UTC offset valid
+# priority1, clockClass 6 (GNSS locked), accuracy within 100 ns, offsetScaledLogVariance,
+# priority2 (grandmasterIdentity follows per port); stepsRemoved 0, timeSource GPS
+struct.pack_into('!BBBHB', PTP_ANNOUNCE_TEMPLATE, 47, 128, 6, 0x21, 0x4E5D, 128)
+PTP_ANNOUNCE_TEMPLATE[63] = 0x20
+
+@dataclass(frozen=True)
+class PTPSlave:
+    """A PTP slave reached over Ethernet from one local port"""
+    interface: str
+    mac: bytes
+    address: bytes  # struct sockaddr_ll for sendmmsg
+    port_identity: bytes  # our clockIdentity + portNumber on that interface
+
+class DatagramBatch:
+    """Preallocated message vectors for exchanging datagrams with recvmmsg/sendmmsg"""
+    
+    def __init__(self, size: int, recv_size: int, send_size: int, control_size: int = 0,
+                 name_size: int = SOCKADDR_SIZE):
+        self.size = size
+        self.control_size = control_size
+        self.name_size = name_size
+        
+        # Payloads and peer addresses live in NumPy arrays the message headers point into
+        self.rx = np.zeros((size, recv_size), dtype=np.uint8)
+        self.tx = np.zeros((size, send_size), dtype=np.uint8)
+        self.rx_names = np.zeros((size, name_size), dtype=np.uint8)
+        self.tx_names = np.zeros((size, name_size), dtype=np.uint8)
+        self.control = np.zeros((size, max(control_size, 8)), dtype=np.uint8)  # 8-aligned rows
+        
+        self._rx_iov = (_IOVec * size)()
+        self._tx_iov = (_IOVec * size)()
+        self._rx_msgs = (_MMsgHdr * size)()
+        self._tx_msgs = (_MMsgHdr * size)()
+        
+        for msgs, iov, data, names in ((self._rx_msgs, self._rx_iov, self.rx, self.rx_names),
+                                       (self._tx_msgs, self._tx_iov, self.tx, self.tx_names)):
+            for i in range(size):
+                iov[i].iov_base = data[i].ctypes.data
+                iov[i].iov_len = data.shape[1]
+                hdr = msgs[i].msg_hdr
+                hdr.msg_name = names[i].ctypes.data
+                hdr.msg_namelen = name_size
+                hdr.msg_iov = ctypes.addressof(iov[i])
+                hdr.msg_iovlen = 1
+            if control_size and msgs is self._rx_msgs:
+                for i in range(size):
+                    msgs[i].msg_hdr.msg_control = self.control[i].ctypes.data
+        
+        # Per-message header fields as arrays, so no Python loop touches them per packet
+        self._rx_fields = np.frombuffer(self._rx_msgs, dtype=_MMSGHDR_DTYPE)
+        self.rx_lens = self._rx_fields['msg_len']  # bytes received per slot
+        
+        # Control message fields decoded as records over whole rows: the first
+        # message, and the one following a timestamp
+        row_size = self.control.shape[1]
+        self._cmsgs = [(offset, np.frombuffer(self.control, dtype=_cmsg_dtype(offset, row_size)))
+                       for offset in (0, TIMESTAMPING_CMSG_SPACE)
+                       if offset + CMSG_HEADER_SIZE + 4 <= row_size]
+        self.tx_lens = np.frombuffer(self._tx_iov, dtype=_IOVEC_DTYPE)['iov_len']  # bytes sent per slot
+    
+    def recv(self, fd: int) -> int:
+        """Wait for at least one datagram and drain up to a batch; returns the count"""
+        self._rx_fields['msg_namelen'] = self.name_size
+        self._rx_fields['msg_controllen'] = self.control_size
+        return _check_syscall(_recvmmsg(fd, self._rx_msgs, self.size, MSG_WAITFORONE, None))
+    
+    def rx_timestamps(self, count: int) -> np.ndarray:
+        """Kernel receive times (ns) of the last recv, 0 where a message has none"""
+        # SCM_TIMESTAMPING is the first control message when the socket enables it
+        if self.control_size < TIMESTAMPING_CMSG_SPACE:
+            return np.zeros(count, dtype=np.int64)
+        first = self._cmsgs[0][1][:count]
+        present = ((self._rx_fields['msg_controllen'][:count] >= TIMESTAMPING_CMSG_SPACE)
+                   & (first['cmsg_level'] == socket.SOL_SOCKET) & (first['cmsg_type'] == SCM_TIMESTAMPING))
+        return np.where(present, first['tv_sec'] * 1_000_000_000 + first['tv_nsec'], 0)
+    
+    def rx_drop_count(self, count: int) -> int:
+        """Largest SO_RXQ_OVFL drop counter in the last recv, 0 if none was reported"""
+        # The counter follows the timestamp when there is one, else it comes first
+        drops = 0
+        controllen = self._rx_fields['msg_controllen'][:count]
+        for offset, cmsgs in self._cmsgs:
+            if self.control_size < offset + RXQ_OVFL_CMSG_SPACE:
+                break
+            cmsg = cmsgs[:count]
+            present = ((controllen >= offset + socket.CMSG_LEN(4))
+                       & (cmsg['cmsg_level'] == socket.SOL_SOCKET) & (cmsg['cmsg_type'] == SO_RXQ_OVFL))
+            if present.any():
+                drops = max(drops, int(cmsg['u32'][present].max()))
+        return drops
+    
+    def send(self, fd: int, count: int) -> int:
+        """Send the first count tx slots to their tx_names addresses"""
+        sent = 0
+        base = ctypes.addressof(self._tx_msgs)
+        while sent < count:
+            sent += _check_syscall(_sendmmsg(fd, base + sent * ctypes.sizeof(_MMsgHdr),
+                                             count - sent, 0))
+        return sent
+
 class GNSSSyncManager:
     """GNSS Synchronization Manager for mobile network timing"""
     
-    def __init__(self, config_file: str = '/etc/mnsf/gnss/active.conf'):
+    def __init__(self, config_file: str = '/etc/mnsf/gnss/active.conf', start_servers: bool = True):
         self.config_file = config_file
         self.status = SyncStatus.UNLOCKED
         self.constellation = Constellation.GPS
+        # Enum member attributes are slow to read; the hot paths use these copies
+        self._status_name = self.status.name
+        self._const_value = self.constellation.value
         self.time_data: Optional[TimeData] = None
         self.position_data: Optional[PositionData] = None
         self.sync_clients: List[Tuple[str, int]] = []
         self.compliance_verified = False
         
+        # Status changes are published under this condition so the PTP
+        # thread can sleep until the clock locks instead of polling
+        self._lock_cv = threading.Condition()
+        self.ptp_interval = PTP_SYNC_INTERVAL
+        self._ptp_slaves: List[PTPSlave] = []  # replaced, never mutated, on registration
+        
+        # Filters that keep single noisy fixes from flapping the sync status
+        self._kf = ScalarKalman(x=25.0, p=25.0, q=1.0, r=25.0)
+        self._quality_kf = ScalarKalman(x=1.0, p=1.0, q=1e-5, r=2.5e-4)
+        
+        # Recent samples as parallel ring-buffer columns, written at idx % HISTORY_SIZE
+        self._hist = {
+            'uncertainty_ns': np.zeros(HISTORY_SIZE, np.float32),
+            't_ns': np.zeros(HISTORY_SIZE, np.int64),  # monotonic receive time
+            'idx': 0
+        }
+        self._uncertainty_stats = RollingStats()  # over the uncertainty_ns column
+        
         # Load configuration
         self.load_configuration()
         
-        # Initialize NTP/PTP server
-        self.init_time_server()
+        # Kernel drop counters per NTP socket fd, and the total already reported
+        self._ntp_drops: Dict[int, int] = {}
+        self._ntp_drops_reported = 0
+        
+        # Initialize NTP/PTP server (skipped when only the sync state is needed, as in tests)
+        if start_servers:
+            self.init_time_server()
         
         logger.info("GNSS Sync Manager initialized")
     
     def load_configuration(self):
         """Load configuration from file"""
         try:
-            with open(self.config_file, 'r') as f:
-                content = f.read()
+            # The GNSS-SDR config must exist, but its contents are not parsed yet
+            os.stat(self.config_file)
                 
             # Parse GNSS-SDR config (simplified)
             self.sampling_rate = 4000000  # Default
             self.frequency = 1575420000  # GPS L1
             
-            # Load compliance settings
-            compliance_file = '/app/configs/global_regulations.yaml'
-            with open(compliance_file, 'r') as f:
-                self.compliance_settings = json.load(f)
+            # Load compliance settings (YAML, or its newer JSON export; shared parse)
+            self.compliance_settings = load_config(COMPLIANCE_FILE)
                 
             self.compliance_verified = True
             logger.info("Configuration loaded successfully")
@@ -112,107 +528,248 @@ class GNSSSyncManager:
     
     def init_time_server(self):
         """Initialize time synchronization server"""
-        # Create NTP server socket
-        self.ntp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.ntp_socket.bind(('0.0.0.0', 123))
+        # Create NTP server sockets: with SO_REUSEPORT the kernel spreads
+        # clients across one socket per worker thread
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else None
+        if hasattr(socket, 'SO_REUSEPORT'):
+            workers = len(cpus) if cpus else os.cpu_count() or 1
+        else:
+            workers = 1
         
-        # Create PTP (IEEE 1588) socket for precise timing
-        self.ptp_socket = socket.socket(socket.AF_PACKET, socket.SOCK_RAW)
+        self.ntp_sockets: List[socket.socket] = []
+        for _ in range(workers):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            if workers > 1:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind(('0.0.0.0', NTP_PORT))
+            try:
+                # Kernel receive timestamps for the NTP receive field
+                sock.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPING,
+                                SOF_TIMESTAMPING_RX_SOFTWARE | SOF_TIMESTAMPING_SOFTWARE)
+            except OSError as e:
+                logger.warning(f"Kernel RX timestamps unavailable, estimating: {e}")
+            try:
+                # Absorb bursts, and count what still overflows the receive queue
+                _set_buffer_size(sock, SO_RCVBUFFORCE, socket.SO_RCVBUF, NTP_RCVBUF)
+                _set_buffer_size(sock, SO_SNDBUFFORCE, socket.SO_SNDBUF, NTP_SNDBUF)
+                sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+            except OSError as e:
+                logger.warning(f"NTP socket buffer tuning unavailable: {e}")
+            self.ntp_sockets.append(sock)
+        self.ntp_socket = self.ntp_sockets[0]
+        
+        # When the usable CPUs are exactly 0..n-1, socket i can serve CPU i:
+        # steer packets to the socket of the CPU that took them and pin its worker
+        self.ntp_cpus: List[Optional[int]] = [None] * workers
+        if workers > 1 and cpus == list(range(workers)):
+            try:
+                _attach_cpu_steering(self.ntp_socket)
+                self.ntp_cpus = cpus
+            except OSError as e:
+                logger.warning(f"NTP CPU steering unavailable: {e}")
+        
+        # Create PTP (IEEE 1588) socket for precise timing; a cooked packet
+        # socket lets each message's sockaddr_ll name the slave's MAC
+        self.ptp_socket = socket.socket(socket.AF_PACKET, socket.SOCK_DGRAM)
         
         # Start server threads
-        self.ntp_thread = threading.Thread(target=self.run_ntp_server, daemon=True)
+        self.ntp_threads = [
+            threading.Thread(target=self.run_ntp_server, args=(sock, cpu), daemon=True)
+            for sock, cpu in zip(self.ntp_sockets, self.ntp_cpus)
+        ]
+        self.ntp_thread = self.ntp_threads[0]
         self.ptp_thread = threading.Thread(target=self.run_ptp_server, daemon=True)
         self.monitor_thread = threading.Thread(target=self.run_compliance_monitor, daemon=True)
         
-        self.ntp_thread.start()
+        for thread in self.ntp_threads:
+            thread.start()
         self.ptp_thread.start()
         self.monitor_thread.start()
         
         logger.info("Time servers initialized")
     
-    def run_ntp_server(self):
-        """Run NTP server for network time synchronization"""
+    def run_ntp_server(self, sock: Optional[socket.socket] = None, cpu: Optional[int] = None):
+        """Run NTP server for network time synchronization on one socket"""
+        sock = sock or self.ntp_socket
+        if cpu is not None:
+            try:
+                os.sched_setaffinity(0, {cpu})  # pid 0: this thread
+            except OSError as e:
+                logger.warning(f"Could not pin NTP worker to CPU {cpu}: {e}")
+        
+        if _recvmmsg is None:
+            return self._run_ntp_server_unbatched(sock)
+        
+        batch = DatagramBatch(NTP_BATCH, NTP_PACKET_SIZE, NTP_PACKET_SIZE, NTP_CMSG_SPACE)
+        batch.tx[:] = NTP_RESPONSE_TEMPLATE  # only timestamps are rewritten per reply
+        fd = sock.fileno()
+        
+        while True:
+            try:
+                received = batch.recv(fd)
+                drops = batch.rx_drop_count(received)
+                if drops:
+                    self._ntp_drops[fd] = drops
+                
+                # Answer every complete request in one sendmmsg burst
+                replies = self._answer_ntp_batch(batch, received)
+                if replies:
+                    batch.send(fd, replies)
+                    
+            except InterruptedError:
+                continue
+            except Exception as e:
+                logger.error(f"NTP server error: {e}")
+                time.sleep(1)
+    
+    def _answer_ntp_batch(self, batch: DatagramBatch, received: int) -> int:
+        """Build replies to the complete requests among the last recv; returns how many"""
+        valid = np.flatnonzero(batch.rx_lens[:received] >= NTP_PACKET_SIZE)
+        replies = len(valid)
+        if replies:
+            batch.tx_names[:replies] = batch.rx_names[valid]
+            self._fill_ntp_batch(batch.rx[valid], batch.tx[:replies], time.time_ns(),
+                                 batch.rx_timestamps(received)[valid])
+        return replies
+    
+    def _run_ntp_server_unbatched(self, sock: socket.socket):
+        """Serve NTP one datagram at a time where recvmmsg is unavailable"""
         while True:
             try:
-                data, addr = self.ntp_socket.recvfrom(1024)
+                data, ancdata, _, addr = sock.recvmsg(1024, NTP_CMSG_SPACE)
+                drops = _scm_rxq_ovfl(ancdata)
+                if drops:
+                    self._ntp_drops[sock.fileno()] = drops
                 
                 if len(data) >= 48:
                     # Parse NTP request and send response
-                    response = self.generate_ntp_response(data)
-                    self.ntp_socket.sendto(response, addr)
+                    response = self.generate_ntp_response(data, _scm_rx_timestamp(ancdata))
+                    sock.sendto(response, addr)
                     
             except Exception as e:
                 logger.error(f"NTP server error: {e}")
                 time.sleep(1)
     
-    def generate_ntp_response(self, request: bytes) -> bytes:
+    def generate_ntp_response(self, request: bytes, rx_ns: int = 0) -> bytes:
         """Generate NTP response with GNSS time"""
-        # Parse NTP request (simplified)
-        version = (request[0] >> 3) & 0x07
-        mode = request[0] & 0x07
-        
-        # Create response header
-        response = bytearray(48)
-        response[0] = 0x24  # Version 4, server mode
-        
-        # Add timestamps
-        current_time = time.time() + 2208988800  # NTP epoch offset
-        
-        # Transmit timestamp (now)
-        tx_ts = self.time_to_ntp(current_time)
-        response[40:48] = tx_ts
+        requests = np.frombuffer(request, dtype=np.uint8, count=NTP_PACKET_SIZE).reshape(1, -1)
+        response = NTP_RESPONSE_TEMPLATE.reshape(1, -1).copy()
+        self._fill_ntp_batch(requests, response, time.time_ns(), np.array([rx_ns], dtype=np.int64))
+        return response.tobytes()
+    
+    def _fill_ntp_batch(self, requests: np.ndarray, out: np.ndarray, now_ns: int,
+                        rx_ns: np.ndarray):
+        """Write the timestamps of NTP responses for a (k, 48) request batch into out,
+        whose rows start as NTP_RESPONSE_TEMPLATE; rx_ns is 0 where unknown"""
+        stamps = out.view(NTP_TIMESTAMP_DTYPE)  # (k, 6) big-endian timestamp fields
         
         # Reference timestamp (GNSS time)
         if self.time_data:
-            ref_ts = self.time_to_ntp(self.time_data.gps_time + 315964800)  # GPS to NTP offset
-            response[16:24] = ref_ts
+            stamps[:, 2] = _ntp_timestamp(
+                int((self.time_data.gps_time + GPS_EPOCH_OFFSET) * 1_000_000_000))
+        else:
+            stamps[:, 2] = (0, 0)
         
         # Origin timestamp (from request)
-        response[24:32] = request[40:48]
+        out[:, 24:32] = requests[:, 40:48]
         
-        # Receive timestamp (when we received it)
-        rx_ts = self.time_to_ntp(current_time - 0.001)  # Estimate
-        response[32:40] = rx_ts
+        # Receive timestamp (when the kernel received it; estimated if unknown)
+        _ntp_timestamps(np.where(rx_ns > 0, rx_ns, now_ns - 1_000_000), stamps[:, 4])
         
-        return bytes(response)
+        # Transmit timestamp (now)
+        stamps[:, 5] = _ntp_timestamp(now_ns)
     
-    def time_to_ntp(self, timestamp: float) -> bytes:
-        """Convert Python timestamp to NTP format"""
-        seconds = int(timestamp)
-        fraction = int((timestamp - seconds) * 2**32)
-        return struct.pack('!II', seconds, fraction)
+    def add_ptp_slave(self, interface: str, mac: str):
+        """Register a PTP slave by the local interface it is reached on and its MAC"""
+        mac_bytes = bytes.fromhex(mac.replace(':', ''))
+        address = struct.pack('=H2siHBB8s', socket.AF_PACKET, ETH_P_1588.to_bytes(2, 'big'),
+                              socket.if_nametoindex(interface), 0, 0, 6, mac_bytes)
+        
+        # EUI-64 clockIdentity from the interface MAC, port 1
+        with open(f'/sys/class/net/{interface}/address') as f:
+            local_mac = bytes.fromhex(f.read().strip().replace(':', ''))
+        port_identity = local_mac[:3] + b'\xff\xfe' + local_mac[3:] + b'\x00\x01'
+        
+        slave = PTPSlave(interface, mac_bytes, address, port_identity)
+        self._ptp_slaves = self._ptp_slaves + [slave]
+        logger.info(f"PTP slave registered: {mac} on {interface}")
     
     def run_ptp_server(self):
         """Run PTP (Precision Time Protocol) server"""
-        # PTP implementation would go here
-        # This is a simplified version
+        # Two-step master: every tick sends Sync and Follow_Up (plus Announce
+        # once per second) to all slaves in a single sendmmsg call
+        batch = None
+        slaves: List[PTPSlave] = []
+        tick = 0
+        
         while True:
             try:
-                # Send sync messages
-                if self.status == SyncStatus.LOCKED and self.time_data:
-                    # Broadcast PTP sync message
-                    sync_msg = self.create_ptp_sync_message()
-                    # In real implementation, send via raw socket
-                    
-                time.sleep(0.1)
+                # Block until update_gnss_data reports a lock; while locked
+                # this returns at once and the loop runs at the Sync rate
+                with self._lock_cv:
+                    self._lock_cv.wait_for(lambda: self.status == SyncStatus.LOCKED)
+                
+                if self.time_data and self._ptp_slaves:
+                    if slaves is not self._ptp_slaves:
+                        slaves = self._ptp_slaves
+                        batch = self._build_ptp_batch(slaves)
+                    count = self._fill_ptp_batch(batch, len(slaves), tick)
+                    if _sendmmsg is None:
+                        for frame, length, slave in zip(batch.tx, batch.tx_lens[:count], slaves * 3):
+                            self.ptp_socket.sendto(frame[:length].tobytes(),
+                                                   (slave.interface, ETH_P_1588, 0, 0, slave.mac))
+                    else:
+                        batch.send(self.ptp_socket.fileno(), count)
+                
+                tick += 1
+                time.sleep(self.ptp_interval)
             except Exception as e:
                 logger.error(f"PTP server error: {e}")
                 time.sleep(1)
     
-    def create_ptp_sync_message(self) -> bytes:
-        """Create PTP sync message"""
-        # Simplified PTP sync message
-        message = bytearray(44)
+    def _build_ptp_batch(self, slaves: List[PTPSlave]) -> DatagramBatch:
+        """Lay out Sync, Follow_Up and Announce rows (in that order) for every slave"""
+        n = len(slaves)
+        batch = DatagramBatch(3 * n, 0, PTP_ANNOUNCE_SIZE, name_size=SOCKADDR_LL_SIZE)
+        tx = batch.tx
+        tx[:n, :PTP_SYNC_SIZE] = np.frombuffer(PTP_SYNC_TEMPLATE, dtype=np.uint8)
+        tx[n:2 * n, :PTP_SYNC_SIZE] = np.frombuffer(PTP_FOLLOW_UP_TEMPLATE, dtype=np.uint8)
+        tx[2 * n:] = np.frombuffer(PTP_ANNOUNCE_TEMPLATE, dtype=np.uint8)
+        batch.tx_lens[:2 * n] = PTP_SYNC_SIZE
+        batch.tx_lens[2 * n:] = PTP_ANNOUNCE_SIZE
         
-        # Header
-        message[0] = 0x10  # Sync message
-        message[1] = 0x02  # Version 2
+        addresses = np.frombuffer(b''.join(s.address for s in slaves), dtype=np.uint8).reshape(n, -1)
+        ports = np.frombuffer(b''.join(s.port_identity for s in slaves), dtype=np.uint8).reshape(n, -1)
+        batch.tx_names[:] = np.tile(addresses, (3, 1))
+        tx[:, 20:30] = np.tile(ports, (3, 1))  # sourcePortIdentity
+        tx[2 * n:, 53:61] = ports[:, :8]  # grandmasterIdentity
+        return batch
+    
+    def _fill_ptp_batch(self, batch: DatagramBatch, n: int, tick: int) -> int:
+        """Write this tick's per-message fields; returns how many rows to send"""
+        tx = batch.tx
+        utc_offset = self.time_data.leap_seconds + TAI_GPS_OFFSET
+        seconds, ns = divmod(time.time_ns() + utc_offset * 1_000_000_000, 1_000_000_000)
+        
+        # Packed once, then copied column-wise into every row: sequenceId,
+        # originTimestamp (48-bit seconds, 32-bit ns), Sync correctionField,
+        # Announce sequenceId and currentUtcOffset
+        fields = bytearray(24)
+        struct.pack_into('!HHIIqHH', fields, 0, tick & 0xFFFF, seconds >> 32, seconds & 0xFFFFFFFF,
+                         ns, int(self.time_data.uncertainty_ns * 65536),
+                         (tick // PTP_ANNOUNCE_TICKS) & 0xFFFF, utc_offset)
+        fields = np.frombuffer(fields, dtype=np.uint8)
         
-        # Correction field (nanoseconds)
-        correction = int(self.time_data.uncertainty_ns * 1e9) if self.time_data else 0
-        message[8:16] = struct.pack('!Q', correction)
+        tx[:2 * n, 30:32] = fields[0:2]
+        tx[:2 * n, 34:44] = fields[2:12]
+        tx[:n, 8:16] = fields[12:20]
+        if tick % PTP_ANNOUNCE_TICKS:
+            return 2 * n
         
-        return bytes(message)
+        tx[2 * n:, 30:32] = fields[20:22]
+        tx[2 * n:, 34:44] = fields[2:12]
+        tx[2 * n:, 44:46] = fields[22:24]
+        return 3 * n
     
     def run_compliance_monitor(self):
         """Monitor compliance with 3GPP and regulatory standards"""
@@ -237,56 +794,111 @@ class GNSSSyncManager:
         
         # Check frequency stability
         # 3GPP requires ±0.1 ppm for base stations
+        self._update_frequency_stability()
         if hasattr(self, 'frequency_stability'):
             if abs(self.frequency_stability) > 0.1e-6:
                 violations.append(f"Frequency stability out of spec: {self.frequency_stability:.2e}")
         
+        # Check for NTP requests the kernel dropped on full receive queues
+        drops = sum(self._ntp_drops.values())
+        if drops > self._ntp_drops_reported:
+            violations.append(f"NTP requests dropped: {drops - self._ntp_drops_reported} since last check")
+            self._ntp_drops_reported = drops
+        
         # Log violations
         if violations:
             logger.warning(f"Compliance violations: {violations}")
             
             # Record in compliance log
             violation_record = {
-                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'timestamp': _utc_now_iso(),
                 'violations': violations,
                 'status': 'non_compliant',
                 'action_taken': 'continue_monitoring'
             }
             
-            with open('/var/log/mnsf/compliance_violations.json', 'a') as f:
-                f.write(json.dumps(violation_record) + '\n')
+            _append_violation(violation_record)
         
         return len(violations) == 0
     
+    def _update_frequency_stability(self):
+        """Estimate fractional frequency stability from the sample history"""
+        hist = self._hist
+        idx = hist['idx']
+        n = min(idx, HISTORY_SIZE)
+        if n < 2:
+            return
+        
+        # Time-error jitter per update interval, as a fractional frequency;
+        # the window spans from the oldest to the newest ring slot
+        t_ns = hist['t_ns']
+        oldest = idx % HISTORY_SIZE if idx > HISTORY_SIZE else 0
+        interval_ns = int(t_ns[(idx - 1) % HISTORY_SIZE] - t_ns[oldest]) / (n - 1)
+        if interval_ns > 0:
+            self.frequency_stability = self._uncertainty_stats.std() / interval_ns
+    
     def update_gnss_data(self, time_data: TimeData, position_data: PositionData):
         """Update GNSS data from receiver"""
         self.time_data = time_data
         self.position_data = position_data
         
+        hist = self._hist
+        i = hist['idx'] % HISTORY_SIZE
+        uncertainty = hist['uncertainty_ns']
+        if hist['idx'] >= HISTORY_SIZE:
+            self._uncertainty_stats.remove(float(uncertainty[i]))
+        uncertainty[i] = time_data.uncertainty_ns
+        self._uncertainty_stats.add(float(uncertainty[i]))  # as stored, so removal matches
+        hist['t_ns'][i] = time.monotonic_ns()
+        hist['idx'] += 1
+        
         # Update sync status
-        if time_data.time_quality > 0.98 and time_data.uncertainty_ns < 50:
-            self.status = SyncStatus.LOCKED
-        elif time_data.time_quality > 0.9:
-            self.status = SyncStatus.TRACKING
-        else:
-            self.status = SyncStatus.ACQUIRING
+        with self._lock_cv:
+            previous = self.status
+            self.status = self._filtered_status(time_data)
+            if self.status != previous:
+                self._status_name = self.status.name
+            if self.status == SyncStatus.LOCKED:
+                self._lock_cv.notify_all()
         
         # Log update
-        logger.info(f"GNSS data updated: Status={self.status.name}, "
+        logger.info(f"GNSS data updated: Status={self._status_name}, "
                    f"Uncertainty={time_data.uncertainty_ns:.1f}ns, "
                    f"Quality={time_data.time_quality:.3f}")
         
-        # Broadcast to clients
-        self.broadcast_sync_update()
+        # Broadcast to clients only when the status actually changes
+        if self.status != previous:
+            self.broadcast_sync_update()
+    
+    def _filtered_status(self, time_data: TimeData) -> SyncStatus:
+        """Classify sync status from filtered uncertainty and quality"""
+        uncertainty = self._kf.update(time_data.uncertainty_ns)
+        quality = self._quality_kf.update(time_data.time_quality)
+        
+        lock_limit = LOCK_UNCERTAINTY_NS
+        if self.status == SyncStatus.LOCKED:
+            lock_limit += LOCK_HYSTERESIS_NS
+        
+        if quality > LOCK_QUALITY and uncertainty < lock_limit:
+            return SyncStatus.LOCKED
+        elif quality > TRACK_QUALITY:
+            return SyncStatus.TRACKING
+        else:
+            return SyncStatus.ACQUIRING
     
     def broadcast_sync_update(self):
         """Broadcast synchronization update to all clients"""
+        # In production, this would send to registered clients
+        # For now, just log, so skip building the update unless it will be written
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
         update_data = {
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'status': self.status.name,
+            'timestamp': _utc_now_iso(),
+            'status': self._status_name,
             'time_data': {
                 'gps_time': self.time_data.gps_time if self.time_data else None,
-                'utc_time': self.time_data.utc_time.isoformat() if self.time_data else None,
+                'utc_time': self.time_data.utc_time if self.time_data else None,
                 'uncertainty_ns': self.time_data.uncertainty_ns if self.time_data else None
             } if self.time_data else None,
             'position_data': {
@@ -296,15 +908,13 @@ class GNSSSyncManager:
             } if self.position_data else None
         }
         
-        # In production, this would send to registered clients
-        # For now, just log
-        logger.debug(f"Sync update: {json.dumps(update_data, default=str)}")
+        logger.debug(f"Sync update: {dumps_json(update_data)}")
     
     def get_sync_info(self) -> Dict:
         """Get synchronization information for monitoring"""
         return {
-            'status': self.status.name,
-            'constellation': self.constellation.value,
+            'status': self._status_name,
+            'constellation': self._const_value,
             'time_data': {
                 'utc': self.time_data.utc_time.isoformat() if self.time_data else None,
                 'gps': self.time_data.gps_time if self.time_data else None,
@@ -321,7 +931,7 @@ class GNSSSyncManager:
             } if self.position_data else None,
             'compliance': {
                 'verified': self.compliance_verified,
-                'last_check': datetime.now(timezone.utc).isoformat(),
+                'last_check': _utc_now_iso(),
                 'standards': ['3GPP TS 36.133', '3GPP TS 25.133', 'ITU-R M.1901']
             }
         }
@@ -331,7 +941,7 @@ class GNSSSyncManager:
         report = {
             'test_id': 'GNSS-SYNC-001',
             'standard': '3GPP TS 36.133 V17.1.0',
-            'test_date': datetime.now(timezone.utc).isoformat(),
+            'test_date': _utc_now_iso(),
             'test_environment': 'LAB',
             'sut': 'MNSF GNSS Sync Module',
             'test_conditions': {
@@ -357,11 +967,8 @@ class GNSSSyncManager:
         }
         
         # Save report
-        report_file = f'/var/data/mnsf/gnss/3gpp_test_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
-        
-        logger.info(f"3GPP test report generated: {report_file}")
+        report_file = f'{REPORT_DIR}/3gpp_test_report_{time.strftime("%Y%m%d_%H%M%S")}.json'
+        _submit_report(report_file, report)  # serialized and written off the caller's thread
         return report
 
 def main():
@@ -388,25 +995,41 @@ def main():
         print("Press Ctrl+C to stop")
         print("=" * 60)
         
+        # Set by SIGINT/SIGTERM; the main thread sleeps on it instead of polling
+        stop = threading.Event()
+        signal.signal(signal.SIGINT, lambda *_: stop.set())
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        
         # Simulate GNSS data updates (in real system, this would come from GNSS-SDR)
         # For demonstration, create simulated data
         def simulate_gnss_data():
-            while True:
+            # Draw all simulator noise up front and walk through it row by row:
+            # uncertainty, latitude, longitude, altitude and the report draw
+            rng = np.random.default_rng()
+            noise = rng.standard_normal(size=(100_000, 5)).astype(np.float32)
+            noise[:, :4] *= np.array([5, 0.0001, 0.0001, 0.5], dtype=np.float32)
+            noise[:, 4] = rng.random(len(noise))
+            noise_i = 0
+            
+            while not stop.is_set():
                 if sync_manager.status != SyncStatus.FAULT:
+                    d_uncertainty, d_lat, d_lon, d_alt, report_draw = noise[noise_i].tolist()
+                    noise_i = (noise_i + 1) % len(noise)
+                    
                     # Create simulated time data
                     time_data = TimeData(
                         gps_time=time.time() - 315964800,  # Convert to GPS time
                         utc_time=datetime.now(timezone.utc),
                         leap_seconds=18,
                         time_quality=0.99,
-                        uncertainty_ns=25.5 + np.random.normal(0, 5)
+                        uncertainty_ns=25.5 + d_uncertainty
                     )
                     
                     # Create simulated position data
                     position_data = PositionData(
-                        latitude=37.7749 + np.random.normal(0, 0.0001),
-                        longitude=-122.4194 + np.random.normal(0, 0.0001),
-                        altitude=10.0 + np.random.normal(0, 0.5),
+                        latitude=37.7749 + d_lat,
+                        longitude=-122.4194 + d_lon,
+                        altitude=10.0 + d_alt,
                         velocity_north=0.1,
                         velocity_east=0.2,
                         velocity_up=0.01,
@@ -418,18 +1041,18 @@ def main():
                     sync_manager.update_gnss_data(time_data, position_data)
                     
                     # Periodically generate test report
-                    if np.random.random() < 0.01:  # 1% chance each iteration
+                    if report_draw < 0.01:  # 1% chance each iteration
                         sync_manager.generate_3gpp_test_report()
                 
-                time.sleep(1)
+                stop.wait(1)
         
         # Start simulation thread
         sim_thread = threading.Thread(target=simulate_gnss_data, daemon=True)
         sim_thread.start()
         
-        # Keep main thread alive
-        while True:
-            time.sleep(1)
+        # Keep main thread alive until a shutdown signal arrives
+        stop.wait()
+        print("\n[!] Shutting down GNSS Sync Module...")
             
     except KeyboardInterrupt:
         print("\n[!] Shutting down GNSS Sync Module...")
@@ -66,6 +66,14 @@ with open('/etc/mnsf/lab_environment.cfg', 'w') as f:
 with open('/var/data/mnsf/lab_config.json', 'w') as f:
     json.dump(lab_config, f, indent=2)
 
+# JSON export of the regulations, loaded in preference to the YAML while newer;
+# it is only a cache, so a read-only config mount just skips it
+try:
+    with open('/app/configs/global_regulations.json', 'w') as f:
+        json.dump(config, f, default=str)
+except OSError as e:
+    print('Skipping JSON regulations export: ' + str(e))
+
 print('Lab environment validated and configured')
 "
 
@@ -6,13 +6,18 @@ Validates GNSS functionality against 3GPP standards
 
 import unittest
 import json
+import socket
+import struct
+import time
 import tempfile
 import shutil
 from pathlib import Path
 from datetime import datetime
 import numpy as np
 
-from modules.gnss.gnss_sync import GNSSSyncManager, TimeData, PositionData, SyncStatus
+from modules.gnss.gnss_sync import GNSSSyncManager, TimeData, PositionData, SyncStatus, RollingStats
+from modules.gnss.gnss_sync import (DatagramBatch, NTP_BATCH, NTP_CMSG_SPACE, NTP_PACKET_SIZE,
+                                    NTP_RESPONSE_TEMPLATE, _recvmmsg)
 
 class TestGNSSCompliance(unittest.TestCase):
     """Test GNSS module compliance with 3GPP standards"""
@@ -129,6 +134,136 @@ SignalSource.gain=40
             self.assertEqual(actual_status, expected_status,
                             f"Status mismatch: expected {expected_status}, got {actual_status}")
     
+    def test_sync_status_filter_rejects_spike(self):
+        """A single noisy fix should not drop a held lock"""
+        sync_mgr = GNSSSyncManager(str(self.config_file), start_servers=False)
+        position_data = PositionData(
+            latitude=37.7749, longitude=-122.4194, altitude=10.0,
+            velocity_north=0.0, velocity_east=0.0, velocity_up=0.0,
+            pdop=1.2, hdop=1.0, vdop=1.5
+        )
+        
+        statuses = []
+        for uncertainty in [25, 25, 25, 60, 25, 200, 200, 200]:
+            time_data = TimeData(
+                gps_time=1000.0,
+                utc_time=datetime.utcnow(),
+                leap_seconds=18,
+                time_quality=0.99,
+                uncertainty_ns=uncertainty
+            )
+            sync_mgr.update_gnss_data(time_data, position_data)
+            statuses.append(sync_mgr.status)
+        
+        self.assertEqual(statuses[:5], [SyncStatus.LOCKED] * 5)
+        self.assertEqual(statuses[-1], SyncStatus.TRACKING)
+    
+    def test_ntp_response_fields(self):
+        """NTP replies should echo the client's transmit time and encode NTP-epoch timestamps"""
+        sync_mgr = GNSSSyncManager(str(self.config_file), start_servers=False)
+        sync_mgr.update_gnss_data(
+            TimeData(gps_time=1000.5, utc_time=datetime.utcnow(), leap_seconds=18,
+                     time_quality=0.99, uncertainty_ns=25.0),
+            PositionData(latitude=37.7749, longitude=-122.4194, altitude=10.0,
+                         velocity_north=0.0, velocity_east=0.0, velocity_up=0.0,
+                         pdop=1.2, hdop=1.0, vdop=1.5)
+        )
+        
+        request = bytearray(48)
+        request[0] = 0x23  # Version 4, client mode
+        request[40:48] = bytes(range(1, 9))  # client transmit timestamp
+        rx_ns = 1_700_000_000_250_000_000
+        
+        before = time.time()
+        response = sync_mgr.generate_ntp_response(bytes(request), rx_ns)
+        self.assertEqual(len(response), 48)
+        
+        # LI 0, VN 4, mode 4 (server); stratum through reference ID come from the template
+        self.assertEqual((response[0] >> 6, (response[0] >> 3) & 0x07, response[0] & 0x07), (0, 4, 4))
+        self.assertEqual(response[1:16], NTP_RESPONSE_TEMPLATE[1:16].tobytes())
+        
+        reference, origin, receive, transmit = struct.unpack('!QQQQ', response[16:48])
+        self.assertEqual(reference, (1000 + 315964800 + 2208988800) << 32 | 1 << 31)
+        self.assertEqual(response[24:32], request[40:48])
+        self.assertEqual(receive, (1_700_000_000 + 2208988800) << 32 | 1 << 30)
+        self.assertAlmostEqual(transmit / 2**32 - 2208988800, before, delta=1.0)
+    
+    @unittest.skipIf(_recvmmsg is None, "recvmmsg is not available")
+    def test_ntp_batch_skips_short_requests(self):
+        """A batch should answer complete requests and drop truncated ones"""
+        sync_mgr = GNSSSyncManager(str(self.config_file), start_servers=False)
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(server.close)
+        self.addCleanup(client.close)
+        server.bind(('127.0.0.1', 0))
+        client.settimeout(0.2)
+        
+        requests = [bytes([0x23]) + bytes(39) + struct.pack('!Q', i) for i in (1, 2)]
+        for data in (requests[0], b'\x23' * 20, requests[1]):
+            client.sendto(data, server.getsockname())
+        
+        batch = DatagramBatch(NTP_BATCH, NTP_PACKET_SIZE, NTP_PACKET_SIZE, NTP_CMSG_SPACE)
+        batch.tx[:] = NTP_RESPONSE_TEMPLATE
+        received = batch.recv(server.fileno())
+        self.assertEqual(received, 3)
+        
+        replies = sync_mgr._answer_ntp_batch(batch, received)
+        self.assertEqual(replies, 2)
+        batch.send(server.fileno(), replies)
+        
+        for data in requests:
+            response = client.recv(1024)
+            self.assertEqual(response[0], 0x24)
+            self.assertEqual(response[24:32], data[40:48])
+        with self.assertRaises(socket.timeout):
+            client.recv(1024)
+    
+    def test_ptp_batch_fields(self):
+        """PTP Sync, Follow_Up and Announce rows should carry IEEE 1588 header fields"""
+        sync_mgr = GNSSSyncManager(str(self.config_file), start_servers=False)
+        sync_mgr.add_ptp_slave('lo', '02:00:00:00:00:01')
+        sync_mgr.add_ptp_slave('lo', '02:00:00:00:00:02')
+        sync_mgr.update_gnss_data(
+            TimeData(gps_time=1000.0, utc_time=datetime.utcnow(), leap_seconds=18,
+                     time_quality=0.99, uncertainty_ns=25.0),
+            PositionData(latitude=37.7749, longitude=-122.4194, altitude=10.0,
+                         velocity_north=0.0, velocity_east=0.0, velocity_up=0.0,
+                         pdop=1.2, hdop=1.0, vdop=1.5)
+        )
+        
+        n = 2
+        batch = sync_mgr._build_ptp_batch(sync_mgr._ptp_slaves)
+        tick = 16
+        count = sync_mgr._fill_ptp_batch(batch, n, tick)
+        self.assertEqual(count, 3 * n)
+        self.assertEqual(list(batch.tx_lens[:count]), [44] * (2 * n) + [64] * n)
+        
+        now_tai = time.time() + 37
+        expected = [(0x10, 0x0200, 0, -3, tick), (0x18, 0x0000, 2, -3, tick), (0x1B, 0x000C, 5, 0, 2)]
+        for row in range(count):
+            message = batch.tx[row, :batch.tx_lens[row]].tobytes()
+            first, version, length, flags = struct.unpack_from('!BBHxxH', message, 0)
+            sequence_id, control, log_interval, seconds_hi, seconds_lo, ns = \
+                struct.unpack_from('!HBbHII', message, 30)
+            self.assertEqual((first, flags, control, log_interval, sequence_id), expected[row // n])
+            self.assertEqual(version, 2)
+            self.assertEqual(length, len(message))
+            self.assertEqual(message[20:30], sync_mgr._ptp_slaves[row % n].port_identity)
+            
+            # originTimestamp is TAI: GPS-UTC leap seconds plus the fixed 19 s TAI-GPS offset
+            self.assertLess(ns, 1_000_000_000)
+            self.assertAlmostEqual((seconds_hi << 32 | seconds_lo) + ns / 1e9, now_tai, delta=1.0)
+        
+        self.assertEqual(struct.unpack_from('!q', batch.tx[0], 8)[0], 25 * 65536)
+        self.assertEqual(struct.unpack_from('!q', batch.tx[n], 8)[0], 0)
+        self.assertEqual(struct.unpack_from('!h', batch.tx[2 * n], 44)[0], 37)
+        
+        # Between Announce intervals only Sync and Follow_Up go out
+        self.assertEqual(sync_mgr._fill_ptp_batch(batch, n, tick + 1), 2 * n)
+        self.assertEqual(struct.unpack_from('!H', batch.tx[0], 30)[0], tick + 1)
+        self.assertEqual(struct.unpack_from('!H', batch.tx[2 * n], 30)[0], 2)
+    
     def test_compliance_report_generation(self):
         """Test 3GPP compliance report generation"""
         # Create test sync manager
@@ -165,6 +300,19 @@ SignalSource.gain=40
         
         self.assertLessEqual(frequency_stability_ppm, max_frequency_error_ppm,
                             f"Frequency stability {frequency_stability_ppm:.3f} ppm exceeds 3GPP limit")
+    
+    def test_rolling_stats_window(self):
+        """Rolling Welford statistics should match NumPy over the same window"""
+        samples = np.random.default_rng(1).normal(25.0, 5.0, 200)
+        window = 32
+        stats = RollingStats()
+        
+        for i, x in enumerate(samples):
+            if i >= window:
+                stats.remove(samples[i - window])
+            stats.add(x)
+        
+        self.assertAlmostEqual(stats.std(), np.std(samples[-window:], ddof=1), places=9)
 
 class TestRegulatoryCompliance(unittest.TestCase):
     """Test regulatory compliance"""
@@ -195,6 +343,44 @@ class TestRegulatoryCompliance(unittest.TestCase):
         for op, params in prohibited_operations:
             compliant = monitor.check_operation(op, params)
             self.assertFalse(compliant, f"Operation {op} should NOT be compliant in lab mode")
+    
+    def test_operation_id_parameters(self):
+        """Operation IDs should accept non-string keys and hash equal numbers alike"""
+        from core.compliance_monitor import _operation_id
+        
+        self.assertEqual(_operation_id('gnss_receive', {1: 2}), _operation_id('gnss_receive', {1: 2.0}))
+        self.assertEqual(_operation_id('gnss_receive', {'gain': np.float64(40.0), 2: 'x'}),
+                         _operation_id('gnss_receive', {2: 'x', 'gain': 40}))
+        self.assertNotEqual(_operation_id('gnss_receive', {'enabled': True}),
+                            _operation_id('gnss_receive', {'enabled': 1}))
+    
+    def test_batch_operation_checks(self):
+        """Test vectorized band and power checks agree with check_operation"""
+        from core.compliance_monitor import ComplianceMonitor
+        
+        monitor = ComplianceMonitor()
+        
+        frequencies = np.array([1575420000, 940000000, 3000000000, np.nan])
+        tx_powers = np.array([-30, 20, np.nan, np.nan])
+        
+        mask = monitor.check_operations(frequencies, tx_powers)
+        
+        self.assertEqual(mask.tolist(), [True, False, False, True])
+        self.assertEqual(monitor.operation_count, 0, "Batch checks should not be logged")
+        
+        def scalar_checks():
+            return [monitor.check_operation('signal_analyze', {
+                        key: value for key, value in (('frequency', freq), ('tx_power', power))
+                        if not np.isnan(value)
+                    }) for freq, power in zip(frequencies, tx_powers)]
+        
+        self.assertEqual(mask.tolist(), scalar_checks())
+        
+        # Without regulatory rules neither path applies the limits
+        monitor.rules = []
+        monitor._compile_rules()
+        self.assertEqual(monitor.check_operations(frequencies, tx_powers).tolist(), scalar_checks())
+        self.assertTrue(monitor.check_operations(frequencies, tx_powers).all())
 
 if __name__ == '__main__':
     # Run tests